@@ -0,0 +1,52 @@
+"""Measure how LppBulkDecoder scales with the number of worker processes.
+
+Run with `python3 -m benchmarks.bulk_scaling [lines]` from the repository
+root, where lines is the number of hex payloads (default: 400000).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from cayennelpp import LppFrame
+from cayennelpp.lpp_bulk import LppBulkDecoder
+
+
+def write_archive(path, lines):
+    """Write an archive of hex encoded payloads to given path."""
+    frame = LppFrame()
+    frame.add_temperature(1, 21.5)
+    frame.add_humidity(2, 45.5)
+    frame.add_gps(3, 42.3519, -87.9094, 10.0)
+    frame.add_voltage(4, 3.3)
+    line = bytes(frame).hex() + "\n"
+    with open(path, "w") as f:
+        for _ in range(lines):
+            f.write(line)
+
+
+def main():
+    """Decode the same archive with increasing number of workers."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        write_archive(path, lines)
+        base = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            decoder = LppBulkDecoder(workers=workers)
+            start = time.perf_counter()
+            count = sum(1 for _ in decoder.decode_file(path))
+            rate = count / (time.perf_counter() - start)
+            base = base or rate
+            print("{:>3} workers {:>12.0f} payloads/s {:>6.2f}x".format(
+                  workers, rate, rate / base))
+            workers *= 2
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
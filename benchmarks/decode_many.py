@@ -0,0 +1,52 @@
+"""Compare LppFrame.from_bytes in a loop with batch and cached decoding.
+
+Run with `python3 -m benchmarks.decode_many [count]` from the repository
+root, where count is the number of payloads (default: 100000).
+"""
+
+import sys
+import time
+
+from cayennelpp import LppFrame
+from cayennelpp.lpp_layout import LppLayoutCache
+
+
+def make_payloads(count):
+    """Return a list of `count` typical payloads."""
+    frame = LppFrame()
+    frame.add_temperature(1, 21.5)
+    frame.add_humidity(2, 45.5)
+    frame.add_gps(3, 42.3519, -87.9094, 10.0)
+    frame.add_digital_input(4, 1)
+    frame.add_voltage(5, 3.3)
+    buf = bytes(frame)
+    return [buf] * count
+
+
+def measure(name, func, payloads):
+    """Run func over payloads and print the throughput."""
+    start = time.perf_counter()
+    func(payloads)
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12.0f} payloads/s".format(name, len(payloads) / elapsed))
+
+
+def main():
+    """Run all variants on the same corpus."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    payloads = make_payloads(count)
+    measure("from_bytes loop", lambda p: [LppFrame.from_bytes(b) for b in p],
+            payloads)
+    measure("decode_many", lambda p: list(LppFrame.decode_many(p)),
+            payloads)
+    measure("decode_many(compact=True)",
+            lambda p: list(LppFrame.decode_many(p, compact=True)), payloads)
+    cache = LppLayoutCache()
+    measure("LppLayoutCache", lambda p: [cache.decode(b) for b in p],
+            payloads)
+    measure("LppLayoutCache(compact)",
+            lambda p: [cache.decode(b, compact=True) for b in p], payloads)
+
+
+if __name__ == '__main__':
+    main()
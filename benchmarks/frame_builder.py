@@ -0,0 +1,60 @@
+"""Compare encoding with LppFrame and with LppFrameBuilder.
+
+Run with `python3 -m benchmarks.frame_builder` from the repository root.
+"""
+
+import timeit
+
+from cayennelpp import LppFrame
+from cayennelpp.lpp_builder import LppFrameBuilder
+
+
+def fill(frame):
+    """Add a typical set of sensor values to given frame or builder."""
+    frame.add_temperature(1, 21.5)
+    frame.add_humidity(2, 45.5)
+    frame.add_barometer(3, 1013.2)
+    frame.add_gps(4, 42.3519, -87.9094, 10.0)
+    frame.add_digital_input(5, 1)
+    frame.add_voltage(6, 3.3)
+    frame.add_accelerometer(7, 0.1, -0.2, 0.98)
+
+
+def with_frame():
+    """Build a LppFrame and encode it."""
+    frame = LppFrame()
+    fill(frame)
+    return bytes(frame)
+
+
+def with_builder():
+    """Encode with a new LppFrameBuilder."""
+    builder = LppFrameBuilder()
+    fill(builder)
+    return bytes(builder)
+
+
+def with_reused_builder(builder=LppFrameBuilder(maxsize=51)):
+    """Encode with a reused LppFrameBuilder into a memoryview."""
+    builder.reset()
+    fill(builder)
+    return builder.view()
+
+
+def main():
+    """Run all variants and print the time per frame."""
+    assert with_frame() == with_builder() == with_reused_builder()
+    number = 20000
+    base = None
+    for name, func in [("LppFrame + bytes()", with_frame),
+                       ("LppFrameBuilder + bytes()", with_builder),
+                       ("reused LppFrameBuilder.view()",
+                        with_reused_builder)]:
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        base = base or best
+        print("{:<32} {:>8.2f} us/frame {:>6.2f}x".format(
+              name, best * 1e6, base / best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Measure how LppFrame.from_bytes scales with the number of items.
+
+Run with `python3 -m benchmarks.frame_scaling` from the repository root,
+the time per item should stay (roughly) constant for growing frames.
+"""
+
+import timeit
+
+from cayennelpp import LppFrame
+
+
+def make_frame(items):
+    """Return a byte string of a frame with given number of items."""
+    frame = LppFrame()
+    for i in range(items):
+        frame.add_temperature(i % 256, 21.5)
+        frame.add_gps(i % 256, 42.3519, -87.9094, 10.0)
+    return bytes(frame)
+
+
+def main():
+    """Run LppFrame.from_bytes for increasing frame sizes."""
+    print("{:>8} {:>8} {:>12} {:>12}".format(
+          "items", "bytes", "ms/frame", "us/item"))
+    for items in [8, 64, 512, 4096]:
+        buf = make_frame(items // 2)
+        number = max(1, 4096 // items)
+        best = min(timeit.repeat(lambda: LppFrame.from_bytes(buf),
+                                 number=number, repeat=5)) / number
+        print("{:>8} {:>8} {:>12.3f} {:>12.3f}".format(
+              items, len(buf), best * 1e3, best * 1e6 / items))
+
+
+if __name__ == '__main__':
+    main()
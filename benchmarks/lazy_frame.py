@@ -0,0 +1,42 @@
+"""Compare header-only inspection of lazy and fully decoded LppFrames.
+
+Run with `python3 -m benchmarks.lazy_frame` from the repository root.
+"""
+
+import timeit
+
+from cayennelpp import LppFrame
+
+
+def make_frame():
+    """Return a byte string of a large frame with various types."""
+    frame = LppFrame()
+    for i in range(8):
+        frame.add_temperature(i, 21.5)
+        frame.add_accelerometer(i, 0.1, -0.2, 0.98)
+        frame.add_gps(i, 42.3519, -87.9094, 10.0)
+        frame.add_voltage(i, 3.3)
+    return bytes(frame)
+
+
+def headers(buf, lazy):
+    """Return the (channel, type) headers of the given frame."""
+    return [(d.channel, int(d.type))
+            for d in LppFrame.from_bytes(buf, lazy=lazy)]
+
+
+def main():
+    """Run header inspection and full decoding."""
+    buf = make_frame()
+    number = 2000
+    for name, func in [
+            ("full decode, headers", lambda: headers(buf, False)),
+            ("lazy decode, headers", lambda: headers(buf, True)),
+            ("lazy decode, get_by_type", lambda: LppFrame.from_bytes(
+                buf, lazy=True).get_by_type(136))]:
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print("{:<28} {:>10.1f} us/frame".format(name, best * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare table lookup decoding of 1 byte types with plain arithmetic.
+
+Decodes every 1 byte type, i.e. digital I/O, presence, humidity,
+percentage, switch, and colour, once via LppType.decode_from, which uses
+the precomputed tables, and once via struct and float division as done
+for all other types. Further, a frame of 16 digital inputs and outputs
+is decoded with LppFrame.from_bytes and LppFrame.decode_many.
+
+Run with `python3 -m benchmarks.lookup_tables [count]` from the repository
+root, where count is the number of decodes per case (default: 200000).
+"""
+
+import struct
+import sys
+import timeit
+
+from cayennelpp import LppFrame
+from cayennelpp.lpp_type import LppType
+
+
+def arithmetic(lpp_type, fmt, buf, offset):
+    """Decode like types with wider fields, i.e. without tables."""
+    raw = struct.unpack_from(fmt, buf, offset)
+    return tuple([raw[i] / lpp_type.scales[i] for i in range(len(raw))])
+
+
+def measure(name, func, count):
+    """Run func count times and print the throughput."""
+    elapsed = min(timeit.repeat(func, number=count, repeat=3))
+    print("{:<32} {:>12.0f} ops/s".format(name, count / elapsed))
+
+
+def main():
+    """Run all cases."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for lpp_type in LppType.get_lpp_types():
+        if lpp_type.size != lpp_type.dimension:
+            continue
+        buf = bytes([0x5B] * lpp_type.size)
+        name = lpp_type.name.lower().replace(" ", "_")
+        measure(name + " (table)",
+                lambda t=lpp_type: t.decode_from(buf, 0), count)
+        measure(name + " (arithmetic)",
+                lambda t=lpp_type, f='>' + lpp_type.decode_format:
+                arithmetic(t, f, buf, 0), count)
+    frame = LppFrame()
+    for i in range(8):
+        frame.add_digital_input(i, i % 2)
+        frame.add_digital_output(8 + i, 1)
+    buf = bytes(frame)
+    measure("dio frame from_bytes", lambda: LppFrame.from_bytes(buf),
+            count // 10)
+    measure("dio frame decode_many(compact)",
+            lambda: list(LppFrame.decode_many([buf], compact=True)),
+            count // 10)
+
+
+if __name__ == '__main__':
+    main()
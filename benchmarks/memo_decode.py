@@ -0,0 +1,76 @@
+"""Compare LppFrame.from_bytes with LppMemoDecoder on duplicate payloads.
+
+The corpus mixes heartbeats and idle digital inputs, which always send
+the same bytes, stationary GPS trackers, which repeat their position, and
+sensors with changing readings, such that about 66% of the payloads are
+duplicates of an earlier one. Each decoder is run twice over the corpus,
+i.e. with a cold and with a warm cache.
+
+Run with `python3 -m benchmarks.memo_decode [count]` from the repository
+root, where count is the number of payloads (default: 100000).
+"""
+
+import random
+import sys
+import time
+
+from cayennelpp import LppFrame
+from cayennelpp.lpp_memo import LppMemoDecoder
+
+
+def make_payloads(count, seed=42):
+    """Return a list of `count` payloads from a mixed fleet of devices."""
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        frame = LppFrame()
+        kind = rng.random()
+        if kind < 0.3:
+            frame.add_digital_input(1, 0)
+            frame.add_voltage(2, 3.3)
+        elif kind < 0.55:
+            frame.add_gps(1, 42.3519 + rng.randrange(8) * 0.01,
+                          -87.9094, 10.0)
+            frame.add_digital_input(2, 1)
+        else:
+            frame.add_temperature(1, rng.randrange(-100, 300) / 10.0)
+            frame.add_humidity(2, rng.randrange(0, 200) / 2.0)
+            frame.add_barometer(3, 1013.2)
+        payloads.append(bytes(frame))
+    return payloads
+
+
+def measure(name, func, payloads):
+    """Run func over payloads and print the throughput."""
+    start = time.perf_counter()
+    func(payloads)
+    elapsed = time.perf_counter() - start
+    print("{:<28} {:>12.0f} payloads/s".format(name, len(payloads) / elapsed))
+
+
+def main():
+    """Run all variants on the same corpus."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    payloads = make_payloads(count)
+    unique = len(set(payloads))
+    print("{} payloads, {:.1%} duplicates".format(
+          count, 1.0 - float(unique) / count))
+    measure("from_bytes loop", lambda p: [LppFrame.from_bytes(b) for b in p],
+            payloads)
+    measure("decode_many(compact=True)",
+            lambda p: list(LppFrame.decode_many(p, compact=True)), payloads)
+    for maxsize in (1024, 65536):
+        memo = LppMemoDecoder(maxsize)
+        for cache in ("cold", "warm"):
+            measure("LppMemoDecoder({}) {}".format(maxsize, cache),
+                    lambda p: [memo.decode(b) for b in p], payloads)
+        memo.clear()
+        for cache in ("cold", "warm"):
+            measure("  .compact {}".format(cache),
+                    lambda p: [memo.decode_compact(b) for b in p], payloads)
+        print("  hit rate {:.1%}, {} entries, {} bytes".format(
+              memo.hit_rate, len(memo), memo.nbytes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Measure the memory held by decoded readings, i.e. LppData objects.
+
+Run with `python3 -m benchmarks.memory [count]` from the repository root,
+where count is the number of decoded frames kept (default: 100000).
+
+With CPython 3.11 a typical reading took 296 bytes when each LppData had
+its own LppType, 184 bytes with shared LppType objects, and 144 bytes
+with `__slots__` for LppData (and LppType, LppFrame).
+"""
+
+import sys
+import tracemalloc
+
+from cayennelpp import LppFrame
+
+
+def make_payload():
+    """Return a typical payload with 4 readings."""
+    frame = LppFrame()
+    frame.add_temperature(1, 21.5)
+    frame.add_humidity(2, 45.5)
+    frame.add_gps(3, 42.3519, -87.9094, 10.0)
+    frame.add_voltage(4, 3.3)
+    return bytes(frame)
+
+
+def main():
+    """Decode and keep payloads, print memory per reading."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    buf = make_payload()
+    LppFrame.from_bytes(buf)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    readings = []
+    for _ in range(count):
+        readings.extend(LppFrame.from_bytes(buf).data)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # exclude the list holding all readings
+    used = current - before - sys.getsizeof(readings)
+    print("{} readings, {:.1f} bytes/reading".format(
+          len(readings), used / len(readings)))
+
+
+if __name__ == '__main__':
+    main()
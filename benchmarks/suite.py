@@ -0,0 +1,168 @@
+"""Benchmark suite for encoding and decoding with PyCayenneLPP.
+
+Measures LppType.encode/decode for every known type, as well as
+LppData.from_bytes/to_bytes and LppFrame.from_bytes/__bytes__ for a
+single item, a typical (7 items), and a maximum (222 bytes) frame.
+For each case operations per second and the allocations of a single
+operation (peak bytes and retained blocks, via tracemalloc) are reported.
+
+Run from the repository root, e.g.:
+
+    python3 -m benchmarks.suite --output baseline.json
+    python3 -m benchmarks.suite --compare baseline.json
+
+The compare mode exits with status 1 if any case is slower than the
+baseline by more than the given threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+from cayennelpp import LppData, LppFrame
+from cayennelpp.lpp_type import LppType
+
+
+def sample_value(lpp_type):
+    """Return a valid value tuple for given type."""
+    value = []
+    for i in range(lpp_type.dimension):
+        limit = (1 << (lpp_type.sizes[i] * 8 - 1)) - 1
+        value.append(min(limit, 1234) / lpp_type.scales[i])
+    return tuple(value)
+
+
+def sample_frames():
+    """Return the single item, typical, and maximum frame."""
+    single = LppFrame()
+    single.add_temperature(1, 21.5)
+    typical = LppFrame()
+    typical.add_temperature(1, 21.5)
+    typical.add_humidity(2, 45.5)
+    typical.add_barometer(3, 1013.2)
+    typical.add_gps(4, 42.3519, -87.9094, 10.0)
+    typical.add_digital_input(5, 1)
+    typical.add_voltage(6, 3.3)
+    typical.add_accelerometer(7, 0.1, -0.2, 0.98)
+    maximum = LppFrame(maxsize=222)
+    for i in range(18):
+        maximum.add_gps(i, 42.3519, -87.9094, 10.0)
+    for i in range(6):
+        maximum.add_temperature(18 + i, -12.3)
+    return [("single", single), ("typical", typical), ("max", maximum)]
+
+
+def cases():
+    """Return a list of (name, function) tuples to benchmark."""
+    result = []
+    for lpp_type in LppType.get_lpp_types():
+        name = lpp_type.name.lower().replace(" ", "_")
+        value = sample_value(lpp_type)
+        buf = bytes(lpp_type.encode(value))
+        result.append(("type.encode." + name,
+                       lambda t=lpp_type, v=value: t.encode(v)))
+        result.append(("type.decode." + name,
+                       lambda t=lpp_type, b=buf: t.decode(b)))
+        data = LppData(1, int(lpp_type), value)
+        dbuf = bytes(data)
+        result.append(("data.to_bytes." + name, data.to_bytes))
+        result.append(("data.from_bytes." + name,
+                       lambda b=dbuf: LppData.from_bytes(b)))
+    for name, frame in sample_frames():
+        fbuf = bytes(frame)
+        result.append(("frame.bytes." + name, frame.__bytes__))
+        result.append(("frame.from_bytes." + name,
+                       lambda b=fbuf: LppFrame.from_bytes(b)))
+    return result
+
+
+def measure_ops(func, min_time):
+    """Return the best operations per second of given function."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=3, number=number))
+    return number / best
+
+
+def measure_allocs(func):
+    """Return peak allocated bytes and retained blocks of one call."""
+    func()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum([s.count_diff for s in after.compare_to(before, 'lineno')])
+    del result
+    return peak - base, blocks
+
+
+def run(selected, min_time):
+    """Run all (selected) cases and return the results dict."""
+    results = {}
+    # subtract what tracemalloc itself accounts for an empty call
+    base_bytes, base_blocks = measure_allocs(lambda: None)
+    for name, func in cases():
+        if selected and not any([s in name for s in selected]):
+            continue
+        ops = measure_ops(func, min_time)
+        alloc_bytes, alloc_blocks = measure_allocs(func)
+        alloc_bytes = max(0, alloc_bytes - base_bytes)
+        alloc_blocks = max(0, alloc_blocks - base_blocks)
+        results[name] = {"ops": ops, "alloc_bytes": alloc_bytes,
+                         "alloc_blocks": alloc_blocks}
+        print("{:<40} {:>12.0f} ops/s {:>8} B {:>5} blocks".format(
+              name, ops, alloc_bytes, alloc_blocks))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print comparison to baseline and return list of regressions."""
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name]["ops"] / baseline[name]["ops"]
+        flag = ""
+        if ratio < 1.0 - threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print("{:<40} {:>8.2f}x {}".format(name, ratio, flag))
+    return regressions
+
+
+def main():
+    """Parse arguments, run the benchmarks, save or compare results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="save results to JSON file")
+    parser.add_argument("-c", "--compare", help="baseline JSON file")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="allowed slowdown (default: 0.1, i.e. 10%%)")
+    parser.add_argument("-m", "--min-time", type=float, default=0.2,
+                        help="minimum time per case in seconds")
+    parser.add_argument("filter", nargs="*",
+                        help="only run cases containing any of these")
+    args = parser.parse_args()
+
+    results = run(args.filter, args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(),
+                       "results": results}, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ functionality for the CayenneLPP format, supporting many sensor types.
 
 from .lpp_data import LppData
 from .lpp_frame import LppFrame
+from .lpp_type import LppType
 from .lpp_util import LppUtil
 
-__all__ = ['LppData', 'LppFrame', 'LppUtil']
+__all__ = ['LppData', 'LppFrame', 'LppType', 'LppUtil']
@@ -0,0 +1,141 @@
+import asyncio
+
+from .lpp_frame import LppFrame
+
+
+def _decode_batch(payloads, compact):
+    """Decode a list of payloads, return results or exceptions in order.
+
+    This is a module level function, such that it can be run in any
+    executor, including a ProcessPoolExecutor.
+    """
+    return list(LppFrame.decode_many(payloads, compact, strict=False))
+
+
+class LppAsyncDecoder(object):
+    """An asyncio pipeline to decode a stream of LPP payloads.
+
+    A LppAsyncDecoder reads raw payloads from an async iterator or an
+    asyncio.Queue, decodes them in micro-batches, and puts the results
+    into a bounded output queue. A batch is decoded as soon as it holds
+    `batch_size` payloads or `latency` seconds passed since its first
+    payload. Batches of at least `offload_size` payloads are decoded in
+    the given `executor` instead of the event loop. A full output queue
+    blocks further reading from the source, i.e. applies backpressure.
+
+    The decoder must be created within the running event loop.
+
+    Attributes:
+        output (asyncio.Queue): decoded LppFrame objects (or lists of
+                                `(channel, type, value)` tuples if
+                                `compact` is set), `None` marks the end
+        decoded (int):          number of successfully decoded payloads
+        failed (int):           number of invalid payloads, which are
+                                passed to `on_error` and then dropped
+    """
+
+    def __init__(self, batch_size=64, latency=0.005, maxsize=1024,
+                 executor=None, offload_size=256, compact=False,
+                 on_error=None):
+        """Create a LppAsyncDecoder with given (optional) settings."""
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive integer.")
+        if latency < 0:
+            raise ValueError("Latency must not be negative.")
+        if maxsize < 1:
+            raise ValueError("Maxsize must be positive integer.")
+        self.batch_size = batch_size
+        self.latency = latency
+        self.executor = executor
+        self.offload_size = offload_size
+        self.compact = compact
+        self.on_error = on_error
+        self.output = asyncio.Queue(maxsize)
+        self.decoded = 0
+        self.failed = 0
+        self.__error = None
+
+    async def __read(self, source, queue):
+        """Internal helper to move payloads from source into queue."""
+        try:
+            async for buf in source:
+                await queue.put(buf)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.__error = exc
+        await queue.put(None)
+
+    async def __next_batch(self, queue):
+        """Internal helper to collect the next batch from queue.
+
+        Return the batch and whether the end of the source was reached.
+        """
+        loop = asyncio.get_event_loop()
+        buf = await queue.get()
+        if buf is None:
+            return [], True
+        batch = [buf]
+        deadline = loop.time() + self.latency
+        while len(batch) < self.batch_size:
+            try:
+                buf = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    buf = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if buf is None:
+                return batch, True
+            batch.append(buf)
+        return batch, False
+
+    async def __decode(self, batch):
+        """Internal helper to decode a batch and emit its results."""
+        if self.executor is not None and len(batch) >= self.offload_size:
+            loop = asyncio.get_event_loop()
+            results = await loop.run_in_executor(
+                self.executor, _decode_batch, batch, self.compact)
+        else:
+            results = _decode_batch(batch, self.compact)
+        for buf, result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.failed += 1
+                if self.on_error is not None:
+                    self.on_error(buf, result)
+                continue
+            self.decoded += 1
+            await self.output.put(result)
+        # yield to the event loop in case the output never blocked
+        await asyncio.sleep(0)
+
+    async def run(self, source):
+        """Decode all payloads from source into the output queue.
+
+        The `source` is either an async iterator or an asyncio.Queue, the
+        latter has to be terminated by putting `None`. When the source is
+        exhausted `None` is put into the output queue. An exception raised
+        by the source is re-raised after all previous payloads are emitted.
+        """
+        reader = None
+        if isinstance(source, asyncio.Queue):
+            queue = source
+        else:
+            queue = asyncio.Queue(max(self.batch_size, self.output.maxsize))
+            self.__error = None
+            reader = asyncio.ensure_future(self.__read(source, queue))
+        try:
+            done = False
+            while not done:
+                batch, done = await self.__next_batch(queue)
+                if batch:
+                    await self.__decode(batch)
+            await self.output.put(None)
+        finally:
+            if reader is not None:
+                reader.cancel()
+        if self.__error is not None:
+            raise self.__error
@@ -0,0 +1,90 @@
+from .lpp_frame import LppFrameAdders
+from .lpp_type import LppType
+
+
+class LppFrameBuilder(LppFrameAdders):
+    """A direct-to-bytes LPP frame builder.
+
+    A LppFrameBuilder offers the same `add_*` functions as LppFrame, but
+    encodes each value straight into an internal buffer without creating
+    LppData objects. Values and `maxsize` are checked just like LppFrame
+    does, the result is returned as bytes or memoryview.
+
+    Attributes:
+        maxsize (int): (optional) byte size limit
+    """
+
+    __slots__ = ('_maxsize', '_buf', '_size', '_count')
+
+    def __init__(self, maxsize=0):
+        """Create an empty LppFrameBuilder with (optional) maxsize."""
+        if maxsize < 0:
+            raise ValueError("Maxsize must be positive integer.")
+        self._maxsize = maxsize
+        self._buf = bytearray(maxsize if maxsize > 0 else 64)
+        self._size = 0
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of data items added to this builder."""
+        return self._count
+
+    def __bytes__(self):
+        """Return the encoded frame as a byte string."""
+        return bytes(self.view())
+
+    def to_bytes(self):
+        """Return the encoded frame as a byte string (for MicroPython)."""
+        return self.__bytes__()
+
+    def view(self):
+        """Return a memoryview of the encoded frame without copying it.
+
+        The view is only valid until the builder is modified again.
+        """
+        return memoryview(self._buf)[:self._size]
+
+    @property
+    def maxsize(self):
+        """Return max allowed byte size for this builder."""
+        return self._maxsize
+
+    @property
+    def size(self):
+        """Return the length of the encoded frame."""
+        return self._size
+
+    @property
+    def remaining(self):
+        """Return the number of bytes left, or `None` without maxsize."""
+        if self._maxsize > 0:
+            return self._maxsize - self._size
+        return None
+
+    def reset(self):
+        """Reset the builder to an empty frame, keeping its buffer."""
+        self._size = 0
+        self._count = 0
+
+    def add_by_type(self, type_, channel, value_tuple):
+        """Generic helper to encode and add a value of given type.
+
+        Each item is written with the precompiled codec of its LppType,
+        see `LppType.encode_item_into`.
+        """
+        if not isinstance(value_tuple, tuple):
+            raise TypeError('Parameter (value_tuple) must be a tuple!')
+        lpp_type = LppType.get_lpp_type(type_)
+        if lpp_type is None:
+            raise ValueError("Invalid LPP data type!")
+        pos = self._size
+        end = pos + lpp_type.size + 2
+        if self._maxsize > 0 and end > self._maxsize:
+            raise BufferError()
+        if end > len(self._buf):
+            buf = bytearray(max(end, 2 * len(self._buf)))
+            buf[:pos] = memoryview(self._buf)[:pos]
+            self._buf = buf
+        lpp_type.encode_item_into(self._buf, pos, channel, value_tuple)
+        self._size = end
+        self._count += 1
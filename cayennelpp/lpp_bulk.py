@@ -0,0 +1,118 @@
+import binascii
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .lpp_frame import LppFrame
+
+
+def _parse_line(line, fmt, key):
+    """Return the payload of a single line in given format."""
+    if fmt == 'hex':
+        return binascii.unhexlify(line.strip())
+    if fmt == 'base64':
+        return binascii.a2b_base64(line.strip())
+    return binascii.a2b_base64(json.loads(line)[key])
+
+
+def _decode_chunk(lines, fmt, key):
+    """Decode a chunk of lines into compact results, `None` if invalid.
+
+    This is a module level function to be run by worker processes, it
+    only returns builtin types to keep pickling cheap.
+    """
+    payloads = []
+    for line in lines:
+        try:
+            payloads.append(_parse_line(line, fmt, key))
+        except (KeyError, TypeError, ValueError):
+            payloads.append(None)
+    decoded = LppFrame.decode_many([p for p in payloads if p is not None],
+                                   compact=True, strict=False)
+    results = []
+    for buf in payloads:
+        if buf is None:
+            results.append(None)
+            continue
+        items = next(decoded)
+        results.append(None if isinstance(items, Exception) else items)
+    return results
+
+
+class LppBulkDecoder(object):
+    """A bulk decoder for large archives of LPP payloads.
+
+    A LppBulkDecoder splits lines of encoded payloads into chunks and
+    decodes them across a pool of worker processes. Supported formats
+    are one hex or base64 encoded payload per line, or JSON lines with
+    a base64 encoded payload in field `key`. Results are yielded in input
+    order, one per line, as lists of `(channel, type, value)` tuples or
+    `None` for a line which is not a valid payload.
+
+    Attributes:
+        workers (int):    number of worker processes, 1 decodes inline
+        chunk_size (int): number of lines per chunk sent to a worker
+        fmt (str):        input format, i.e. 'hex', 'base64', or 'json'
+        key (str):        name of the payload field in JSON lines
+    """
+
+    formats = ('hex', 'base64', 'json')
+
+    def __init__(self, workers=None, chunk_size=10000, fmt='hex',
+                 key='payload'):
+        """Create a LppBulkDecoder object with (optional) arguments."""
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Workers must be positive integer.")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive integer.")
+        if fmt not in self.formats:
+            raise ValueError("Invalid format, must be one of: " +
+                             ", ".join(self.formats))
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.fmt = fmt
+        self.key = key
+
+    def __chunks(self, lines):
+        """Internal helper to split lines into lists of chunk size."""
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def decode_lines(self, lines):
+        """Decode an iterable of lines and yield the results in order.
+
+        At most two chunks per worker are in flight at any time, hence
+        lines are read lazily and memory usage does not grow with input.
+        """
+        chunks = self.__chunks(lines)
+        if self.workers == 1:
+            for chunk in chunks:
+                for result in _decode_chunk(chunk, self.fmt, self.key):
+                    yield result
+            return
+        with ProcessPoolExecutor(self.workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(
+                    _decode_chunk, chunk, self.fmt, self.key))
+                if len(pending) >= 2 * self.workers:
+                    for result in pending.popleft().result():
+                        yield result
+            while pending:
+                for result in pending.popleft().result():
+                    yield result
+
+    def decode_file(self, path):
+        """Decode all lines of given file and yield the results in order."""
+        with open(path) as f:
+            for result in self.decode_lines(f):
+                yield result
@@ -14,6 +14,8 @@ class LppData(object):
         value (tuple):  data value(s)
     """
 
+    __slots__ = ('channel', 'type', 'value')
+
     def __init__(self, chn, type_, value):
         """Create a LppData object with given attributes."""
         self.channel = chn
@@ -31,11 +33,23 @@ class LppData(object):
                 raise ValueError("Invalid value, must be positive!")
         self.value = value
 
+    @classmethod
+    def _from_valid(cls, chn, lpp_type, value):
+        """Internal helper to create a LppData of already checked values.
+
+        Unlike the constructor, `lpp_type` is a LppType object and neither
+        it nor the value tuple are checked again.
+        """
+        data = cls.__new__(cls)
+        data.channel = chn
+        data.type = lpp_type
+        data.value = value
+        return data
+
     def __bytes__(self):
         """Return a byte string representation of this LppData object."""
-        hdr_buf = bytearray([self.channel, int(self.type)])
-        dat_buf = self.type.encode(self.value)
-        buf = hdr_buf + dat_buf
+        buf = bytearray(self.type.size + 2)
+        self.pack_into(buf, 0)
         return bytes(buf)
 
     def __len__(self):
@@ -51,16 +65,90 @@ class LppData(object):
         """Explicit wrapper for MicroPython support."""
         return self.__bytes__()
 
+    def pack_into(self, buf, offset=0):
+        """Write this LppData object into a buffer at given offset.
+
+        The `buf` must be writable, e.g. a bytearray or a memoryview of it,
+        no intermediate buffers are created. Return the number of bytes
+        written.
+        """
+        size = self.type.size + 2
+        if len(buf) - offset < size:
+            raise BufferError("Buffer too small!")
+        return self.type.encode_item_into(buf, offset, self.channel,
+                                          self.value)
+
     @classmethod
-    def from_bytes(class_object, buf):
-        """Parse a given byte string and return a LppData object."""
-        if len(buf) < 3:
+    def from_bytes(class_object, buf, offset=0):
+        """Parse a given byte string and return a LppData object.
+
+        The optional `offset` denotes the start of the LppData within `buf`,
+        which may be any object supporting the buffer protocol, e.g. bytes,
+        bytearray, memoryview, or mmap. The buffer is never copied.
+        """
+        if len(buf) - offset < 3:
             raise BufferError("Invalid buffer size!")
-        chn = buf[0]
-        type_ = buf[1]
+        chn = buf[offset]
+        type_ = buf[offset + 1]
         lpp_type = LppType.get_lpp_type(type_)
+        if lpp_type is None:
+            raise ValueError("Invalid LPP data type!")
         size = lpp_type.size
-        if len(buf) < size + 2:
+        if len(buf) - offset < size + 2:
             raise BufferError("Buffer too small!")
-        value = lpp_type.decode(buf[2:(2 + size)])
+        value = lpp_type.decode_from(buf, offset + 2)
         return class_object(chn, type_, value)
+
+
+class LppLazyData(LppData):
+    """A lazily decoded LPP data object.
+
+    A LppLazyData only holds the channel and type of a LppData item
+    and its offset within a byte string. The value is decoded on first
+    access, which makes inspecting channels and types of a frame cheap.
+
+    Attributes:
+        chn (int):      data channel number
+        type (LppType): data type
+        value (tuple):  data value(s), decoded on first access
+    """
+
+    __slots__ = ('_buf', '_offset', '_value')
+
+    def __init__(self, chn, lpp_type, buf, offset):
+        """Create a LppLazyData object for a LppData item within buf."""
+        self.channel = chn
+        self.type = lpp_type
+        self._buf = buf
+        self._offset = offset
+        self._value = None
+
+    @property
+    def value(self):
+        """Return data value(s), decode them if not done before."""
+        if self._value is None:
+            self._value = self.type.decode_from(self._buf, self._offset + 2)
+            self._buf = None
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """Set data value(s), replacing the encoded ones."""
+        self._value = value
+        self._buf = None
+
+    @classmethod
+    def from_bytes(class_object, buf, offset=0):
+        """Parse the header of a LppData item and return LppLazyData.
+
+        Sizes are checked right away, however `buf` is not copied and must
+        not be modified until the value is accessed.
+        """
+        if len(buf) - offset < 3:
+            raise BufferError("Invalid buffer size!")
+        lpp_type = LppType.get_lpp_type(buf[offset + 1])
+        if lpp_type is None:
+            raise ValueError("Invalid LPP data type!")
+        if len(buf) - offset < lpp_type.size + 2:
+            raise BufferError("Buffer too small!")
+        return class_object(buf[offset], lpp_type, buf, offset)
@@ -1,127 +1,58 @@
-from .lpp_data import LppData
+from .lpp_data import LppData, LppLazyData
+from .lpp_type import LppType
 
 
-class LppFrame(object):
-    """A LPP frame instance.
+class LppVerdict(object):
+    """The result of validating a byte string with `LppFrame.validate`.
 
-    A LppFrame can hold multiple LppData objects to be encoded or
-    decoded at once. It also provides convenient helper functions
-    to easily add sensor values of certain type.
+    A LppVerdict evaluates to True if the byte string is a valid frame.
+    Otherwise `offset` is the position of the first invalid item and
+    `reason` one of the class attributes TRUNCATED_HEADER, UNKNOWN_TYPE,
+    or TRUNCATED_VALUE.
 
     Attributes:
-        data (list): a list of LppData objects
-        maxsize (int): (optional) byte size limit
+        valid (bool):   whether the byte string is a valid frame
+        count (int):    number of valid items (before the first error)
+        size (int):     byte size of valid items (before the first error)
+        offset (int):   offset of the first error, None if valid
+        reason (str):   reason of the first error, None if valid
     """
 
-    def __init__(self, data=None, maxsize=0):
-        """Create a LppFrame object with (optional) arguments."""
-        self._maxsize = maxsize
-        self._data = []
-        if data:
-            for d in data:
-                self.__add_data_item(d)
-
-    def __str__(self):
-        """Return a pretty string representation of the LppFrame object."""
-        out = "LppFrame(data = ["
-        if self._data:
-            out = out + "\n"
-        for d in self._data:
-            out = out + "  " + str(d) + "\n"
-        out = out + "])"
-        return out
-
-    def __len__(self):
-        """Return the number of LppData items in this LppFrame."""
-        return len(self._data)
-
-    def __iter__(self):
-        """Return an iterator over all LppData items in this LppFrame."""
-        count = 0
-        while count < len(self._data):
-            yield self._data[count]
-            count += 1
-
-    def __bytes__(self):
-        """Return this LppFrame object as a byte string."""
-        buf = bytearray()
-        for d in self._data:
-            buf += bytes(d)
-        return bytes(buf)
+    __slots__ = ('valid', 'count', 'size', 'offset', 'reason')
 
-    def to_bytes(self):
-        """Return this LppFrame object as a byte string (for MicroPython)."""
-        buf = bytearray()
-        for d in self._data:
-            buf += d.to_bytes()
-        return bytes(buf)
+    TRUNCATED_HEADER = "truncated header"
+    UNKNOWN_TYPE = "unknown type"
+    TRUNCATED_VALUE = "truncated value"
 
-    @classmethod
-    def from_bytes(cls, buf):
-        """Parse a given byte string and return as a LppFrame object."""
-        i = 0
-        data = []
-        while i < len(buf):
-            lppdata = LppData.from_bytes(buf[i:])
-            data.append(lppdata)
-            i = i + len(lppdata)
-        return cls(data)
-
-    def __add_data_item(self, item):
-        """Helper function to add an LppData item to this LppFrame."""
-        if not isinstance(item, LppData):
-            raise TypeError()
-        if self.maxsize > 0:
-            if self.size + len(item) > self.maxsize:
-                raise BufferError()
-        self._data.append(item)
+    def __init__(self, count, size, offset=None, reason=None):
+        """Create a LppVerdict object with given attributes."""
+        self.valid = reason is None
+        self.count = count
+        self.size = size
+        self.offset = offset
+        self.reason = reason
 
-    @property
-    def data(self):
-        """Return list of data items."""
-        return self._data
+    def __bool__(self):
+        """Return whether the validated byte string is valid."""
+        return self.valid
 
-    @property
-    def maxsize(self):
-        """Return max allowed byte size for this LppFrame."""
-        return self._maxsize
+    def __str__(self):
+        """Return a pretty string representation of the LppVerdict."""
+        return 'LppVerdict(valid = {}, count = {}, size = {}, ' \
+               'offset = {}, reason = {})'.format(
+                   self.valid, self.count, self.size, self.offset,
+                   self.reason)
 
-    @maxsize.setter
-    def maxsize(self, value):
-        """Set the max byte size for this LppFrame."""
-        if value < 0:
-            raise ValueError("Maxsize must be positive integer.")
-        if value > 0 and value < self.size:
-            raise ValueError("Maxsize must be greater than current frame size")
-        self._maxsize = value
 
-    def reset(self):
-        """Reset LppFrame by clearing the list of LppData items."""
-        self._data.clear()
-
-    @property
-    def size(self):
-        """Return the length of the LppFrame byte string representation."""
-        size = 0
-        for d in self._data:
-            size += len(d)
-        return size
+class LppFrameAdders(object):
+    """Helper functions to add sensor values of certain type.
 
-    def get_by_type(self, type_):
-        """Return sub list of data with items matching given type."""
-        return [d for d in self.data if int(d.type) == type_]
+    This mixin implements all `add_*` functions on top of a generic
+    `add_by_type(type_, channel, value_tuple)`, which has to be provided
+    by the subclass. It is shared by LppFrame and LppFrameBuilder.
+    """
 
-    def get_by_name(self, name):
-        """Return sub list of data with items matching given name."""
-        name = name.strip().lower()
-        return [d for d in self.data if str(d.type).lower().startswith(name)]
-
-    def add_by_type(self, type_, channel, value_tuple):
-        """Generic helper to add LppDate to this LppFrame."""
-        if not isinstance(value_tuple, tuple):
-            raise TypeError('Parameter (value_tuple) must be a tuple!')
-        data = LppData(channel, type_, value_tuple)
-        self.__add_data_item(data)
+    __slots__ = ()
 
     def add_digital_input(self, channel, value):
         """Create and add a digital input LppData item."""
@@ -238,3 +169,479 @@ class LppFrame(object):
     def add_switch(self, channel, value):
         """Create and add a switch LppData item."""
         self.add_by_type(142, channel, (value, ))
+
+
+class LppFrame(LppFrameAdders):
+    """A LPP frame instance.
+
+    A LppFrame can hold multiple LppData objects to be encoded or
+    decoded at once. It also provides convenient helper functions
+    to easily add sensor values of certain type.
+
+    Lookups by type, name, or channel use indexes, which are built on
+    the first query and dropped whenever items are added or removed.
+    Items added to or removed from `data` directly are detected by the
+    changed number of items, the size and indexes are recomputed then.
+
+    Attributes:
+        data (list): a list of LppData objects
+        maxsize (int): (optional) byte size limit
+    """
+
+    __slots__ = ('_maxsize', '_data', '_size', '_count', '_index')
+
+    def __init__(self, data=None, maxsize=0):
+        """Create a LppFrame object with (optional) arguments."""
+        self._maxsize = maxsize
+        self._data = []
+        self._size = 0
+        self._count = 0
+        self._index = None
+        if data:
+            for d in data:
+                self.__add_data_item(d)
+
+    @classmethod
+    def _from_valid(cls, data, size):
+        """Internal helper to create a LppFrame of already checked items.
+
+        The `data` list of LppData items of `size` bytes is used as is,
+        without checking each item again.
+        """
+        frame = cls()
+        frame._data = data
+        frame._size = size
+        frame._count = len(data)
+        return frame
+
+    def __str__(self):
+        """Return a pretty string representation of the LppFrame object."""
+        out = "LppFrame(data = ["
+        if self._data:
+            out = out + "\n"
+        for d in self._data:
+            out = out + "  " + str(d) + "\n"
+        out = out + "])"
+        return out
+
+    def __len__(self):
+        """Return the number of LppData items in this LppFrame."""
+        return len(self._data)
+
+    def __iter__(self):
+        """Return an iterator over all LppData items in this LppFrame."""
+        count = 0
+        while count < len(self._data):
+            yield self._data[count]
+            count += 1
+
+    def __bytes__(self):
+        """Return this LppFrame object as a byte string."""
+        buf = bytearray(self.size)
+        self.pack_into(buf, 0)
+        return bytes(buf)
+
+    def to_bytes(self):
+        """Return this LppFrame object as a byte string (for MicroPython)."""
+        return self.__bytes__()
+
+    def pack_into(self, buf, offset=0):
+        """Write this LppFrame object into a buffer at given offset.
+
+        The `buf` must be writable, e.g. a bytearray or a memoryview of it,
+        all LppData items are written straight into it. Return the number
+        of bytes written.
+        """
+        if len(buf) - offset < self.size:
+            raise BufferError("Buffer too small!")
+        pos = offset
+        for d in self._data:
+            pos += d.pack_into(buf, pos)
+        return pos - offset
+
+    @classmethod
+    def from_bytes(cls, buf, lazy=False):
+        """Parse a given byte string and return as a LppFrame object.
+
+        The buffer is walked once by offset without copying any part of it,
+        hence `buf` may be any object supporting the buffer protocol, e.g.
+        bytes, bytearray, memoryview, or mmap.
+
+        If `lazy` is set, only channels and types are parsed and each value
+        is decoded on first access. A mutable `buf` is copied once for that.
+        """
+        if lazy:
+            if not isinstance(buf, bytes):
+                buf = bytes(buf)
+            parse = LppLazyData.from_bytes
+        else:
+            parse = LppData.from_bytes
+        i = 0
+        end = len(buf)
+        data = []
+        while i < end:
+            lppdata = parse(buf, i)
+            data.append(lppdata)
+            i = i + len(lppdata)
+        return cls(data)
+
+    @staticmethod
+    def walk(buf):
+        """Walk the headers of a given byte string and yield each item.
+
+        Yield an `(offset, channel, lpp_type)` tuple per item, no values
+        are decoded. Raise BufferError for a truncated header or value,
+        and ValueError for an unknown type.
+        """
+        get_lpp_type = LppType.get_lpp_type
+        i = 0
+        end = len(buf)
+        while i < end:
+            if end - i < 3:
+                raise BufferError("Invalid buffer size!")
+            lpp_type = get_lpp_type(buf[i + 1])
+            if lpp_type is None:
+                raise ValueError("Invalid LPP data type!")
+            size = lpp_type.size + 2
+            if end - i < size:
+                raise BufferError("Buffer too small!")
+            yield i, buf[i], lpp_type
+            i += size
+
+    @staticmethod
+    def decode_raw(buf):
+        """Parse a given byte string into unscaled integers.
+
+        Return a list of `(channel, type, values, scales)` tuples, where
+        `values` are the sign corrected integers as encoded, i.e. without
+        any float division, and `scales` the scale of each value.
+        """
+        return [(chn, lpp_type.type, lpp_type.decode_raw_from(buf, i + 2),
+                 lpp_type.scales)
+                for i, chn, lpp_type in LppFrame.walk(buf)]
+
+    @staticmethod
+    def encode_raw(items):
+        """Encode a list of `(channel, type, values)` unscaled integers.
+
+        This is the exact inverse of `decode_raw`, any further elements
+        of the tuples, i.e. scales, are ignored. Return a byte string.
+        """
+        lpp_types = []
+        size = 0
+        for item in items:
+            lpp_type = LppType.get_lpp_type(item[1])
+            if lpp_type is None:
+                raise ValueError("Invalid LPP data type!")
+            lpp_types.append(lpp_type)
+            size += lpp_type.size + 2
+        buf = bytearray(size)
+        pos = 0
+        for i in range(len(lpp_types)):
+            pos += lpp_types[i].encode_raw_item_into(buf, pos, items[i][0],
+                                                     items[i][2])
+        return bytes(buf)
+
+    @staticmethod
+    def validate(buf):
+        """Check whether a given byte string is a valid LppFrame.
+
+        Only the headers are walked against the type table, neither values
+        are decoded nor LppData objects created, and nothing is raised.
+        Return a LppVerdict with the item count and size, as well as the
+        offset and reason of the first error, if any.
+        """
+        count = 0
+        size = 0
+        try:
+            for i, _, lpp_type in LppFrame.walk(buf):
+                count += 1
+                size = i + lpp_type.size + 2
+        except ValueError:
+            return LppVerdict(count, size, size, LppVerdict.UNKNOWN_TYPE)
+        except BufferError:
+            if len(buf) - size < 3:
+                return LppVerdict(count, size, size,
+                                  LppVerdict.TRUNCATED_HEADER)
+            return LppVerdict(count, size, size, LppVerdict.TRUNCATED_VALUE)
+        return LppVerdict(count, size)
+
+    @classmethod
+    def decode_many(cls, payloads, compact=False, strict=True):
+        """Parse an iterable of byte strings and yield a result for each.
+
+        This is a batch variant of `from_bytes`, which walks each payload
+        once. Results are yielded lazily as LppFrame objects, or if
+        `compact` is set as lists of `(channel, type, value)` tuples
+        without creating any LppData objects. If `strict` is not set, the
+        BufferError or ValueError of an invalid payload is yielded in place
+        of its result and decoding continues with the next payload.
+        """
+        walk = cls.walk
+        for buf in payloads:
+            try:
+                items = []
+                for i, chn, lpp_type in walk(buf):
+                    value = lpp_type.decode_from(buf, i + 2)
+                    if compact:
+                        items.append((chn, lpp_type.type, value))
+                    else:
+                        items.append(LppData(chn, lpp_type.type, value))
+            except (BufferError, ValueError) as exc:
+                if strict:
+                    raise
+                yield exc
+                continue
+            if compact:
+                yield items
+            else:
+                yield cls(items)
+
+    def __add_data_item(self, item):
+        """Helper function to add an LppData item to this LppFrame."""
+        if not self.try_add(item):
+            raise BufferError()
+
+    def _sync(self):
+        """Internal helper to recompute the size if `data` was modified.
+
+        Items appended to or removed from `data` directly change its
+        length, the size is recomputed and the indexes dropped then.
+        """
+        if len(self._data) != self._count:
+            self._size = sum([len(d) for d in self._data])
+            self._count = len(self._data)
+            self._index = None
+
+    @property
+    def data(self):
+        """Return list of data items.
+
+        Items may be appended to or removed from this list directly, the
+        add functions check `maxsize` though. Replacing an item in place
+        is not detected, use `reset()` and the add functions instead.
+        """
+        return self._data
+
+    @property
+    def maxsize(self):
+        """Return max allowed byte size for this LppFrame."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        """Set the max byte size for this LppFrame."""
+        if value < 0:
+            raise ValueError("Maxsize must be positive integer.")
+        if value > 0 and value < self.size:
+            raise ValueError("Maxsize must be greater than current frame size")
+        self._maxsize = value
+
+    def reset(self):
+        """Reset LppFrame by clearing the list of LppData items."""
+        self._data.clear()
+        self._size = 0
+        self._count = 0
+        self._index = None
+
+    @property
+    def size(self):
+        """Return the length of the LppFrame byte string representation."""
+        self._sync()
+        return self._size
+
+    @property
+    def remaining(self):
+        """Return the number of bytes left, or `None` without maxsize."""
+        if self._maxsize > 0:
+            return self._maxsize - self.size
+        return None
+
+    def try_add(self, item):
+        """Add an LppData item if it fits, return whether it was added."""
+        if not isinstance(item, LppData):
+            raise TypeError()
+        self._sync()
+        size = len(item)
+        if self._maxsize > 0 and self._size + size > self._maxsize:
+            return False
+        self._data.append(item)
+        self._size += size
+        self._count += 1
+        self._index = None
+        return True
+
+    def __get_index(self):
+        """Internal helper to return the (new) indexes of all items.
+
+        Returns a tuple of dicts mapping type IDs, channels, and
+        `(channel, type)` pairs to lists of items in frame order.
+        """
+        self._sync()
+        if self._index is None:
+            by_type = {}
+            by_chn = {}
+            by_key = {}
+            for d in self._data:
+                type_ = d.type.type
+                if type_ in by_type:
+                    by_type[type_].append(d)
+                else:
+                    by_type[type_] = [d]
+                if d.channel in by_chn:
+                    by_chn[d.channel].append(d)
+                else:
+                    by_chn[d.channel] = [d]
+                key = (d.channel, type_)
+                if key in by_key:
+                    by_key[key].append(d)
+                else:
+                    by_key[key] = [d]
+            self._index = (by_type, by_chn, by_key)
+        return self._index
+
+    def get_by_type(self, type_):
+        """Return sub list of data with items matching given type."""
+        return list(self.__get_index()[0].get(type_, ()))
+
+    def get_by_name(self, name):
+        """Return sub list of data with items matching given name."""
+        by_type = self.__get_index()[0]
+        types = [t for t in LppType.get_lpp_types_by_name(name)
+                 if t in by_type]
+        if len(types) == 1:
+            return list(by_type[types[0]])
+        if not types:
+            return []
+        return [d for d in self._data if d.type.type in types]
+
+    def get_by_channel(self, channel, type_=None):
+        """Return sub list of data with items matching given channel.
+
+        If `type_` is given, only items of that type are returned.
+        """
+        if type_ is None:
+            return list(self.__get_index()[1].get(channel, ()))
+        return list(self.__get_index()[2].get((channel, type_), ()))
+
+    def add_by_type(self, type_, channel, value_tuple):
+        """Generic helper to add LppDate to this LppFrame."""
+        if not isinstance(value_tuple, tuple):
+            raise TypeError('Parameter (value_tuple) must be a tuple!')
+        data = LppData(channel, type_, value_tuple)
+        self.__add_data_item(data)
+
+    def try_add_by_type(self, type_, channel, value_tuple):
+        """Add LppData to this LppFrame if it fits, return whether it did.
+
+        Unlike `add_by_type` this does not raise BufferError if maxsize is
+        exceeded, invalid arguments raise as before.
+        """
+        if not isinstance(value_tuple, tuple):
+            raise TypeError('Parameter (value_tuple) must be a tuple!')
+        lpp_type = LppType.get_lpp_type(type_)
+        if lpp_type is not None and self._maxsize > 0:
+            if self.size + lpp_type.size + 2 > self._maxsize:
+                return False
+        return self.try_add(LppData(channel, type_, value_tuple))
+
+
+class LppCachedFrame(LppFrame):
+    """A LPP frame instance with cached encoding.
+
+    A LppCachedFrame keeps its byte string representation once encoded,
+    together with the byte offset of each LppData item. Values updated
+    via `set_value` are re-encoded in place, all other bytes are kept,
+    and `bytes()` returns the cached byte string while nothing changed.
+    Values must not be changed through the LppData items directly.
+    """
+
+    __slots__ = ('_buf', '_bytes', '_offsets')
+
+    def __init__(self, data=None, maxsize=0):
+        """Create a LppCachedFrame object with (optional) arguments."""
+        self._buf = None
+        self._bytes = None
+        self._offsets = None
+        super().__init__(data, maxsize)
+
+    def __invalidate(self):
+        """Internal helper to drop the cached encoding."""
+        self._buf = None
+        self._bytes = None
+        self._offsets = None
+
+    def __encode(self):
+        """Internal helper to encode all items and index their offsets."""
+        buf = bytearray(self.size)
+        offsets = {}
+        pos = 0
+        for i in range(len(self._data)):
+            d = self._data[i]
+            key = (d.channel, int(d.type))
+            if key not in offsets:
+                offsets[key] = (pos, i)
+            pos += d.pack_into(buf, pos)
+        self._buf = buf
+        self._offsets = offsets
+
+    def _sync(self):
+        """Internal helper to drop the cached encoding if `data` changed."""
+        if len(self._data) != self._count:
+            super()._sync()
+            self.__invalidate()
+
+    def __bytes__(self):
+        """Return this LppFrame object as (cached) byte string."""
+        self._sync()
+        if self._bytes is None:
+            if self._buf is None:
+                self.__encode()
+            self._bytes = bytes(self._buf)
+        return self._bytes
+
+    def pack_into(self, buf, offset=0):
+        """Copy the cached encoding into a buffer at given offset."""
+        if len(buf) - offset < self.size:
+            raise BufferError("Buffer too small!")
+        if self._buf is None:
+            self.__encode()
+        buf[offset:(offset + self.size)] = self._buf
+        return self.size
+
+    def try_add(self, item):
+        """Add an LppData item if it fits, return whether it was added."""
+        added = super().try_add(item)
+        if added:
+            self.__invalidate()
+        return added
+
+    def reset(self):
+        """Reset LppFrame by clearing the list of LppData items."""
+        super().reset()
+        self.__invalidate()
+
+    def set_value(self, channel, type_, value):
+        """Update the value of the first item of given channel and type.
+
+        Only the bytes of that item are re-encoded within the cached
+        encoding. The item is replaced by a new LppData object, hence items
+        shared with other frames are not modified. Raise KeyError if there
+        is no such item, and ValueError for an invalid value, in which case
+        the item is left unchanged.
+        """
+        self._sync()
+        if self._buf is None:
+            self.__encode()
+        if (channel, type_) not in self._offsets:
+            raise KeyError((channel, type_))
+        pos, index = self._offsets[(channel, type_)]
+        item = LppData(channel, type_, value)
+        try:
+            item.type.encode_into(self._buf, pos + 2, item.value)
+        except ValueError:
+            self.__invalidate()
+            raise
+        self._data[index] = item
+        self._index = None
+        self._bytes = None
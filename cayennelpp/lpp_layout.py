@@ -0,0 +1,215 @@
+import struct
+from collections import OrderedDict
+
+from .lpp_data import LppData
+from .lpp_frame import LppFrame
+from .lpp_type import LppType
+
+
+class LppLayout(object):
+    """A compiled LPP frame layout.
+
+    A LppLayout describes a frame by its sequence of (channel, type)
+    headers. It compiles a single struct format for the whole frame,
+    such that a matching byte string is decoded in one step.
+
+    Attributes:
+        headers (tuple): sequence of (channel, type) tuples
+        size (int):      byte size of a matching frame
+    """
+
+    def __init__(self, headers):
+        """Create a LppLayout object for given (channel, type) headers."""
+        fmt = '>'
+        items = []
+        pos = 0
+        size = 0
+        for chn, type_ in headers:
+            if not isinstance(chn, int) or not 0 <= chn <= 0xff:
+                raise ValueError("Invalid LPP data channel!")
+            lpp_type = LppType.get_lpp_type(type_)
+            if lpp_type is None:
+                raise ValueError("Invalid LPP data type!")
+            fmt += 'BB' + lpp_type.decode_format
+            items.append((pos, chn, type_, lpp_type))
+            pos += len(lpp_type.decode_format) + 2
+            size += lpp_type.size + 2
+        self.headers = tuple([(i[1], i[2]) for i in items])
+        self.size = size
+        self._fmt = fmt
+        self._items = tuple(items)
+
+    def __len__(self):
+        """Return the number of LppData items in this LppLayout."""
+        return len(self._items)
+
+    @classmethod
+    def from_bytes(cls, buf):
+        """Walk the headers of a given byte string and return its layout."""
+        headers = [(chn, lpp_type.type)
+                   for _, chn, lpp_type in LppFrame.walk(buf)]
+        return cls(headers)
+
+    def _decode_items(self, buf):
+        """Internal helper to decode (chn, type, value) tuples from buf.
+
+        Return `None` if the byte string does not match this layout.
+        """
+        if len(buf) != self.size:
+            return None
+        raw = struct.unpack_from(self._fmt, buf, 0)
+        items = []
+        for pos, chn, type_, lpp_type in self._items:
+            if raw[pos] != chn or raw[pos + 1] != type_:
+                return None
+            items.append((chn, type_, lpp_type.unpack_values(raw, pos + 2)))
+        return items
+
+    def decode(self, buf, compact=False):
+        """Parse a byte string matching this layout in a single step.
+
+        Return a LppFrame, or if `compact` is set a list of
+        `(channel, type, value)` tuples.
+        """
+        items = self._decode_items(buf)
+        if items is None:
+            raise ValueError("Buffer does not match layout!")
+        if compact:
+            return items
+        return LppFrame([LppData(*i) for i in items])
+
+
+class LppLayoutCache(object):
+    """A bounded LRU cache of compiled LppLayout objects.
+
+    The cache decodes byte strings using the LppLayout last seen for the
+    same payload length and leading header. Any mismatch or unknown
+    signature falls back to walking the headers and compiles a new
+    LppLayout, which replaces the least recently used one if full.
+
+    Attributes:
+        maxsize (int): maximum number of cached layouts
+        hits (int):    number of payloads decoded with a cached layout
+        misses (int):  number of payloads which required a header walk
+    """
+
+    def __init__(self, maxsize=1024):
+        """Create an empty LppLayoutCache for up to `maxsize` layouts."""
+        if maxsize < 1:
+            raise ValueError("Maxsize must be positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._layouts = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached layouts."""
+        return len(self._layouts)
+
+    def clear(self):
+        """Remove all cached layouts and reset the counters."""
+        self._layouts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, buf, compact=False):
+        """Parse a given byte string using a cached layout if possible.
+
+        Return a LppFrame, or if `compact` is set a list of
+        `(channel, type, value)` tuples.
+        """
+        if len(buf) < 2:
+            # nothing to cache, raises BufferError if not empty
+            self.misses += 1
+            return next(LppFrame.decode_many([buf], compact=compact))
+        key = (len(buf), buf[0], buf[1])
+        layouts = self._layouts
+        layout = layouts.get(key)
+        items = None
+        if layout is not None:
+            items = layout._decode_items(buf)
+        if items is None:
+            self.misses += 1
+            layout = LppLayout.from_bytes(buf)
+            items = layout._decode_items(buf)
+            layouts[key] = layout
+            if len(layouts) > self.maxsize:
+                layouts.popitem(last=False)
+        else:
+            self.hits += 1
+            layouts.move_to_end(key)
+        if compact:
+            return items
+        return LppFrame([LppData(*i) for i in items])
+
+
+class LppSchema(LppLayout):
+    """A compiled LPP frame schema for encoding and decoding.
+
+    A LppSchema is a LppLayout which additionally compiles an encoder,
+    such that a flat tuple of values, e.g. `(temperature, humidity, lat,
+    lon, alt)` for `LppSchema([(1, 103), (2, 104), (3, 136)])`, is packed
+    into a frame with a single struct call. Values are checked just like
+    LppData does.
+    """
+
+    def __init__(self, headers):
+        """Create a LppSchema object for given (channel, type) headers."""
+        super().__init__(headers)
+        enc_fmt = '>'
+        template = []
+        plan = []
+        for _, chn, type_, lpp_type in self._items:
+            enc_fmt += 'BB' + lpp_type.encode_format
+            template += [chn, type_]
+            for field in lpp_type.fields:
+                plan.append((field, len(template)))
+                template += [0, 0] if field.size == 3 else [0]
+        self._enc_fmt = enc_fmt
+        self._template = tuple(template)
+        self._plan = tuple(plan)
+
+    @property
+    def dimension(self):
+        """Return the number of values of a frame of this schema."""
+        return len(self._plan)
+
+    def __raw_values(self, values):
+        """Internal helper to convert values into a list of integers."""
+        if len(values) != len(self._plan):
+            raise ValueError("Invalid number of data values!")
+        raw = list(self._template)
+        for i in range(len(values)):
+            field, pos = self._plan[i]
+            value = field.to_raw(values[i])
+            if field.size == 3:
+                raw[pos] = value >> 16
+                raw[pos + 1] = value & 0xffff
+            else:
+                raw[pos] = value
+        return raw
+
+    def encode(self, values):
+        """Encode a flat tuple of values and return the byte string."""
+        return struct.pack(self._enc_fmt, *self.__raw_values(values))
+
+    def encode_into(self, buf, offset, values):
+        """Encode a flat tuple of values into a buffer at given offset.
+
+        Return the number of bytes written.
+        """
+        if len(buf) - offset < self.size:
+            raise BufferError("Buffer too small!")
+        struct.pack_into(self._enc_fmt, buf, offset,
+                         *self.__raw_values(values))
+        return self.size
+
+    def decode_values(self, buf):
+        """Parse a byte string of this schema into a flat tuple of values."""
+        items = self._decode_items(buf)
+        if items is None:
+            raise ValueError("Buffer does not match layout!")
+        values = []
+        for item in items:
+            values += item[2]
+        return tuple(values)
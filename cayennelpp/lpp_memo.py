@@ -0,0 +1,122 @@
+import struct
+import sys
+from collections import OrderedDict
+
+from .lpp_data import LppData
+from .lpp_frame import LppFrame
+from .lpp_type import LppType
+
+
+class LppMemoDecoder(object):
+    """A memoizing decoder for repeated identical payloads.
+
+    Byte-identical payloads, e.g. heartbeats or stationary GPS trackers,
+    are decoded only once. Results are kept in a bounded LRU cache keyed
+    by the payload bytes as immutable tuples of `(channel, type, value)`
+    tuples. Hence, cached results cannot be corrupted by callers: `decode`
+    returns a new LppFrame of new LppData items for every call, which are
+    not checked again, and `decode_compact` returns the shared immutable
+    tuple. Invalid payloads are not cached.
+
+    Attributes:
+        maxsize (int): maximum number of cached payloads
+        hits (int):    number of payloads found in the cache
+        misses (int):  number of payloads which had to be decoded
+        nbytes (int):  approximate memory used by cached keys and results
+    """
+
+    # approximate memory of an empty tuple and of each of its elements
+    __tuple_size = sys.getsizeof(())
+    __ptr_size = struct.calcsize('P')
+
+    def __init__(self, maxsize=1024):
+        """Create an empty LppMemoDecoder for up to `maxsize` payloads."""
+        if maxsize < 1:
+            raise ValueError("Maxsize must be positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached payloads."""
+        return len(self._cache)
+
+    @property
+    def hit_rate(self):
+        """Return the share of payloads found in the cache, 0 if none."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return float(self.hits) / total
+
+    def stats(self):
+        """Return a dict of cache statistics."""
+        return {'entries': len(self._cache), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hit_rate, 'nbytes': self.nbytes}
+
+    def clear(self):
+        """Remove all cached payloads and reset the statistics."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+
+    def __decode(self, key):
+        """Internal helper to decode a payload and cache its entry.
+
+        An entry is a tuple of the compact items and its estimated memory.
+        Entries hold no references to other objects than numbers and
+        tuples, such that the garbage collector stops tracking them.
+        """
+        self.misses += 1
+        items = []
+        size = self.__tuple_size
+        ptr = self.__ptr_size
+        # the key, the entry and items tuples, and a tuple per item
+        nbytes = sys.getsizeof(key) + 2 * size + 2 * ptr
+        for i, chn, lpp_type in LppFrame.walk(key):
+            value = lpp_type.decode_from(key, i + 2)
+            items.append((chn, lpp_type.type, value))
+            nbytes += 2 * size + (4 + len(value)) * ptr
+        entry = (tuple(items), nbytes)
+        cache = self._cache
+        cache[key] = entry
+        self.nbytes += nbytes
+        if len(cache) > self.maxsize:
+            self.nbytes -= cache.popitem(last=False)[1][1]
+        return entry
+
+    def decode_compact(self, buf):
+        """Parse a byte string into a tuple of `(channel, type, value)`.
+
+        The returned tuple may be shared with other callers. Raise
+        BufferError or ValueError for an invalid payload.
+        """
+        key = bytes(buf)
+        entry = self._cache.get(key)
+        if entry is None:
+            return self.__decode(key)[0]
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return entry[0]
+
+    def decode(self, buf):
+        """Parse a byte string and return a new LppFrame.
+
+        Raise BufferError or ValueError for an invalid payload.
+        """
+        key = bytes(buf)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self.__decode(key)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        new = LppData._from_valid
+        get_lpp_type = LppType.get_lpp_type
+        data = [new(chn, get_lpp_type(type_), value)
+                for chn, type_, value in entry[0]]
+        return LppFrame._from_valid(data, len(key))
@@ -0,0 +1,178 @@
+import numpy as np
+
+from .lpp_frame import LppFrame
+from .lpp_type import LppType
+
+
+class LppNumpy():
+    """Vectorized Cayenne LPP functions based on NumPy.
+
+    This class provides helper functions to decode and encode many
+    payloads sharing one layout, i.e. the same sequence of channels and
+    types, at once from and into NumPy arrays. NumPy is an optional
+    dependency (`pycayennelpp[numpy]`), and this module is not imported
+    by the package itself.
+    """
+
+    @staticmethod
+    def __as_array(payloads):
+        """Internal helper to convert payloads into a 2D uint8 array."""
+        if isinstance(payloads, np.ndarray):
+            if payloads.ndim != 2 or payloads.dtype != np.uint8:
+                raise ValueError('Array must be 2D with dtype uint8!')
+            return payloads
+        payloads = [bytes(p) for p in payloads]
+        if not payloads:
+            raise ValueError('No payloads given!')
+        length = len(payloads[0])
+        for p in payloads:
+            if len(p) != length:
+                raise ValueError('Payloads must have equal length!')
+        arr = np.frombuffer(b''.join(payloads), dtype=np.uint8)
+        return arr.reshape(len(payloads), length)
+
+    @staticmethod
+    def layout(buf):
+        """Return the layout of a payload as list of (offset, chn, type)."""
+        return [(i, chn, lpp_type.type)
+                for i, chn, lpp_type in LppFrame.walk(bytes(buf))]
+
+    @staticmethod
+    def _field(arr, pos, size, signed):
+        """Return the big endian integers of given byte columns."""
+        val = np.zeros(arr.shape[0], dtype=np.int64)
+        for k in range(size):
+            val = (val << 8) | arr[:, pos + k]
+        if signed:
+            limit = 1 << (size * 8)
+            val = np.where(val >= (limit >> 1), val - limit, val)
+        return val
+
+    @classmethod
+    def decode(cls, payloads):
+        """Decode payloads sharing one layout into NumPy arrays.
+
+        The `payloads` are either a list of byte strings of equal length or
+        a `(N, frame_len)` array of dtype uint8. The layout is taken from
+        the first payload, all others must have the same header bytes, and
+        each (channel, type) pair may occur only once. Return a dict which
+        maps `(channel, type, dimension)` to a float64 array of length N
+        with the decoded values.
+        """
+        arr = cls.__as_array(payloads)
+        if arr.shape[0] == 0:
+            raise ValueError('No payloads given!')
+        layout = cls.layout(arr[0])
+        if len(set([(chn, type_) for _, chn, type_ in layout])) != \
+                len(layout):
+            raise ValueError('Duplicate (channel, type) in layout!')
+        if layout:
+            hdr_cols = []
+            hdr_vals = []
+            for pos, chn, type_ in layout:
+                hdr_cols += [pos, pos + 1]
+                hdr_vals += [chn, type_]
+            if not (arr[:, hdr_cols] == hdr_vals).all():
+                raise ValueError('Payloads do not share one layout!')
+        columns = {}
+        for pos, chn, type_ in layout:
+            lpp_type = LppType.get_lpp_type(type_)
+            pos += 2
+            for dim in range(lpp_type.dimension):
+                size = lpp_type.sizes[dim]
+                val = cls._field(arr, pos, size, lpp_type.signs[dim])
+                columns[(chn, type_, dim)] = val / lpp_type.scales[dim]
+                pos += size
+        return columns
+
+    @staticmethod
+    def __raw_field(col, scale, size, signed):
+        """Internal helper to scale a column into masked integers.
+
+        Return the integers and a boolean array marking invalid rows. All
+        checks are done before casting to int64, such that values beyond
+        its range are flagged instead of wrapping. Negative values beyond
+        the int64 range are flagged as well, unlike LppData would wrap.
+        """
+        limit = 1 << (size * 8)
+        col = np.asarray(col)
+        if col.dtype.kind in 'iub':
+            invalid = col >= limit
+            if not signed:
+                invalid |= col < 0
+            col = np.where(invalid, 0, col).astype(np.int64)
+            # products may overflow for large negative values, which keeps
+            # the lower bytes and hence the masked result intact
+            raw = col * scale
+            invalid |= (col >= 0) & (raw >= limit)
+        else:
+            col = col.astype(np.float64)
+            with np.errstate(over='ignore', invalid='ignore'):
+                scaled = col * scale
+                invalid = ~np.isfinite(scaled)
+                invalid |= scaled >= limit
+                invalid |= scaled < -2.0 ** 63
+            if not signed:
+                invalid |= col < 0
+            raw = np.trunc(np.where(invalid, 0, scaled)).astype(np.int64)
+        return raw & (limit - 1), invalid
+
+    @classmethod
+    def encode(cls, headers, columns, as_bytes=False):
+        """Encode columns of values into many payloads of one layout.
+
+        The layout is given by `headers`, a list of unique (channel, type)
+        tuples, and `columns` maps each `(channel, type, dimension)` to an
+        array of values, all of the same length N. Values are scaled,
+        truncated, and checked like LppData does, but for all rows at once.
+
+        Return a tuple of the payloads, either as `(N, frame_len)` uint8
+        array or as list of byte strings if `as_bytes` is set, and an array
+        of the indices of invalid rows. Data bytes of invalid rows are zero.
+        """
+        if len(set(headers)) != len(headers):
+            raise ValueError('Duplicate (channel, type) in headers!')
+        layout = []
+        rows = None
+        for chn, type_ in headers:
+            if not isinstance(chn, int) or not 0 <= chn <= 0xff:
+                raise ValueError('Invalid LPP data channel!')
+            lpp_type = LppType.get_lpp_type(type_)
+            if lpp_type is None:
+                raise ValueError('Invalid LPP data type!')
+            for dim in range(lpp_type.dimension):
+                if (chn, type_, dim) not in columns:
+                    raise ValueError('Missing column {}!'.format(
+                                     (chn, type_, dim)))
+                length = len(columns[(chn, type_, dim)])
+                if rows is not None and length != rows:
+                    raise ValueError('Columns must have equal length!')
+                rows = length
+            layout.append((chn, lpp_type))
+        rows = rows or 0
+        fields = []
+        invalid = np.zeros(rows, dtype=bool)
+        pos = 0
+        for chn, lpp_type in layout:
+            pos += 2
+            for dim in range(lpp_type.dimension):
+                size = lpp_type.sizes[dim]
+                raw, bad = cls.__raw_field(
+                    columns[(chn, int(lpp_type), dim)],
+                    lpp_type.scales[dim], size, lpp_type.signs[dim])
+                invalid |= bad
+                fields.append((pos, size, raw))
+                pos += size
+        arr = np.zeros((rows, pos), dtype=np.uint8)
+        pos = 0
+        for chn, lpp_type in layout:
+            arr[:, pos] = chn
+            arr[:, pos + 1] = int(lpp_type)
+            pos += lpp_type.size + 2
+        for pos, size, raw in fields:
+            raw = np.where(invalid, 0, raw)
+            for k in range(size):
+                arr[:, pos + k] = (raw >> ((size - 1 - k) * 8)) & 0xff
+        if as_bytes:
+            arr = [row.tobytes() for row in arr]
+        return arr, np.flatnonzero(invalid)
@@ -0,0 +1,238 @@
+from .lpp_data import LppData
+from .lpp_frame import LppFrame
+
+
+class LppPacker(object):
+    """A packer to split LppData items across multiple LppFrames.
+
+    A LppPacker distributes items over as few frames of at most `maxsize`
+    bytes as possible, e.g. to fit the maximum LoRaWAN payload size of the
+    current data rate. Supported modes are:
+
+    - 'ordered': keep the item order and start a new frame when full
+    - 'ffd':     first fit decreasing, fast with near optimal results
+    - 'exact':   branch and bound search for the optimum, starting from
+                 the ffd result and limited to `max_steps` search steps
+
+    Optionally, a `priority` function maps items to numbers, and items of
+    higher priority are placed into earlier frames, in 'exact' mode only
+    the order of frames and items follows priority. A `group` function
+    maps items to keys, and items with the same key are kept together in
+    one frame if they fit, `group=True` groups items by channel. If a
+    spreading factor `sf` is set, the 'exact' mode minimises the total
+    time on air instead of the number of frames.
+
+    Attributes:
+        maxsize (int):  maximum frame size in bytes
+        mode (str):     packing mode, i.e. 'ordered', 'ffd', or 'exact'
+        sf (int):       (optional) LoRa spreading factor for airtime
+        bw (int):       LoRa bandwidth in Hz
+        cr (int):       LoRa coding rate, 1 to 4 for 4/5 to 4/8
+    """
+
+    modes = ('ordered', 'ffd', 'exact')
+
+    def __init__(self, maxsize, mode='ffd', priority=None, group=None,
+                 sf=None, bw=125000, cr=1, max_steps=100000):
+        """Create a LppPacker object with given (optional) arguments."""
+        if maxsize < 3:
+            raise ValueError("Maxsize must be at least 3 bytes.")
+        if mode not in self.modes:
+            raise ValueError("Invalid mode, must be one of: " +
+                             ", ".join(self.modes))
+        if sf is not None and not 6 <= sf <= 12:
+            raise ValueError("Spreading factor must be within 6 to 12.")
+        if group is True:
+            group = self.__channel
+        self.maxsize = maxsize
+        self.mode = mode
+        self.priority = priority
+        self.group = group
+        self.sf = sf
+        self.bw = bw
+        self.cr = cr
+        self.max_steps = max_steps
+
+    @staticmethod
+    def __channel(item):
+        """Internal helper to group items by channel."""
+        return item.channel
+
+    @staticmethod
+    def time_on_air(size, sf, bw=125000, cr=1, preamble=8, overhead=13):
+        """Return the LoRa time on air in seconds of a given payload size.
+
+        The `overhead` of 13 bytes accounts for the LoRaWAN MAC header,
+        frame header, port, and MIC of an uplink without options. Explicit
+        header and CRC are assumed, and low data rate optimisation is used
+        for symbol times above 16 ms, as by the LoRaWAN regional parameters.
+        """
+        t_sym = float(1 << sf) / bw
+        de = 1 if t_sym > 0.016 else 0
+        bits = 8 * (size + overhead) - 4 * sf + 28 + 16
+        div = 4 * (sf - 2 * de)
+        symbols = 8 + max(-(-bits // div) * (cr + 4), 0)
+        return (preamble + 4.25 + symbols) * t_sym
+
+    def airtime(self, frame):
+        """Return the time on air of a frame (or size) for this packer."""
+        if self.sf is None:
+            raise ValueError("Spreading factor (sf) not set.")
+        size = frame if isinstance(frame, int) else frame.size
+        return self.time_on_air(size, self.sf, self.bw, self.cr)
+
+    def __cost(self, sizes):
+        """Internal helper to return the cost of frames of given sizes."""
+        if self.sf is None:
+            return len(sizes)
+        return sum([self.airtime(s) for s in sizes])
+
+    def __units(self, items):
+        """Internal helper to return the units to pack and their ranks.
+
+        A unit is a list of items to be placed into the same frame, units
+        are sorted by priority and a lower rank means a higher priority.
+        """
+        if self.group is None:
+            units = [[d] for d in items]
+        else:
+            keys = []
+            groups = {}
+            for d in items:
+                key = self.group(d)
+                if key not in groups:
+                    keys.append(key)
+                    groups[key] = []
+                groups[key].append(d)
+            units = []
+            for key in keys:
+                unit = groups[key]
+                if sum([len(d) for d in unit]) <= self.maxsize:
+                    units.append(unit)
+                else:
+                    units += [[d] for d in unit]
+        if self.priority is None:
+            return units, [0] * len(units)
+        prios = [max([self.priority(d) for d in u]) for u in units]
+        order = sorted(range(len(units)), key=lambda i: -prios[i])
+        return [units[i] for i in order], [-prios[i] for i in order]
+
+    def __ffd(self, units, sizes, ranks):
+        """Internal helper to pack units first fit (decreasing)."""
+        bins = []
+        loads = []
+        order = range(len(units))
+        if self.mode != 'ordered':
+            order = sorted(order, key=lambda i: (ranks[i], -sizes[i]))
+        for i in order:
+            if self.mode == 'ordered':
+                if loads and loads[-1] + sizes[i] <= self.maxsize:
+                    bins[-1].append(i)
+                    loads[-1] += sizes[i]
+                    continue
+            else:
+                for b in range(len(bins)):
+                    if loads[b] + sizes[i] <= self.maxsize:
+                        bins[b].append(i)
+                        loads[b] += sizes[i]
+                        break
+                else:
+                    b = None
+                if b is not None:
+                    continue
+            bins.append([i])
+            loads.append(sizes[i])
+        return bins, loads
+
+    def __exact(self, units, sizes, bins, loads):
+        """Internal helper to search for a cheaper packing than given.
+
+        The branch and bound search is iterative, such that its depth is
+        not limited by the recursion limit, but only by `max_steps`.
+        """
+        if self.sf is None and \
+                len(bins) == -(-sum(sizes) // self.maxsize):
+            # the given packing needs the least possible number of frames
+            return bins
+        order = sorted(range(len(units)), key=lambda i: -sizes[i])
+        best_cost = self.__cost(loads)
+        best = [list(b) for b in bins]
+        cur_bins = []
+        cur_loads = []
+        # one entry of [unit, candidate bins, next candidate] per placed
+        # unit, the last candidate is always a new bin
+        stack = []
+        steps = 0
+        while steps < self.max_steps:
+            steps += 1
+            cost = self.__cost(cur_loads)
+            if cost < best_cost:
+                if len(stack) == len(order):
+                    best_cost = cost
+                    best = [list(b) for b in cur_bins]
+                else:
+                    i = order[len(stack)]
+                    candidates = []
+                    seen = set()
+                    for b in range(len(cur_bins)):
+                        if cur_loads[b] + sizes[i] > self.maxsize:
+                            continue
+                        if cur_loads[b] in seen:
+                            continue
+                        seen.add(cur_loads[b])
+                        candidates.append(b)
+                    candidates.append(len(cur_bins))
+                    stack.append([i, candidates, 0])
+            # undo the last placement and continue with the next candidate
+            while stack:
+                entry = stack[-1]
+                i, candidates, pos = entry
+                if pos > 0:
+                    b = candidates[pos - 1]
+                    cur_bins[b].pop()
+                    cur_loads[b] -= sizes[i]
+                    if not cur_bins[b]:
+                        cur_bins.pop()
+                        cur_loads.pop()
+                if pos < len(candidates):
+                    b = candidates[pos]
+                    entry[2] = pos + 1
+                    if b == len(cur_bins):
+                        cur_bins.append([])
+                        cur_loads.append(0)
+                    cur_bins[b].append(i)
+                    cur_loads[b] += sizes[i]
+                    break
+                stack.pop()
+            else:
+                break
+        return best
+
+    def pack(self, items):
+        """Pack LppData items into a list of LppFrame objects.
+
+        Items may also be given as raw `(channel, type, value)` tuples.
+        Raise ValueError if a single item exceeds the maxsize.
+        """
+        items = [d if isinstance(d, LppData) else LppData(*d)
+                 for d in items]
+        for d in items:
+            if len(d) > self.maxsize:
+                raise ValueError("Item exceeds maxsize: " + str(d))
+        units, ranks = self.__units(items)
+        sizes = [sum([len(d) for d in u]) for u in units]
+        bins, loads = self.__ffd(units, sizes, ranks)
+        if self.mode == 'exact':
+            bins = self.__exact(units, sizes, bins, loads)
+        if self.mode != 'ordered':
+            # keep the unit order (priority) within and across frames
+            bins = [sorted(b) for b in bins]
+            bins.sort(key=lambda b: b[0])
+        frames = []
+        for b in bins:
+            frame = LppFrame(maxsize=self.maxsize)
+            for i in b:
+                for d in units[i]:
+                    frame.try_add(d)
+            frames.append(frame)
+        return frames
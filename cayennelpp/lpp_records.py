@@ -0,0 +1,83 @@
+from array import array
+
+from .lpp_frame import LppFrame
+from .lpp_type import LppType
+
+
+class LppRecords(object):
+    """Reusable, preallocated storage of decoded LppData items.
+
+    A LppRecords object holds one `array.array` per column, i.e. channels,
+    types, dimensions, and values, for up to `capacity` items. Decoding a
+    payload with `decode` overwrites these columns in place and returns
+    the number of items, hence a decode loop reusing the same LppRecords
+    retains no memory per payload. The values of item `i` are stored at
+    `values[i * width:i * width + dims[i]]`.
+
+    Attributes:
+        capacity (int):     maximum number of items
+        width (int):        number of value slots per item
+        count (int):        number of items of the last decoded payload
+        channels (array):   channel of each item
+        types (array):      type ID of each item
+        dims (array):       number of values of each item
+        values (array):     values of all items as floats
+    """
+
+    __slots__ = ('capacity', 'width', 'count', 'channels', 'types', 'dims',
+                 'values')
+
+    def __init__(self, capacity=64):
+        """Create a LppRecords object for up to `capacity` items.
+
+        The width is the largest dimension of all types registered so far.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be positive integer.")
+        width = max([t.dimension for t in LppType.get_lpp_types()])
+        self.capacity = capacity
+        self.width = width
+        self.count = 0
+        self.channels = array('B', bytes(capacity))
+        self.types = array('B', bytes(capacity))
+        self.dims = array('B', bytes(capacity))
+        self.values = array('d', bytes(8 * capacity * width))
+
+    def __len__(self):
+        """Return the number of items of the last decoded payload."""
+        return self.count
+
+    def decode(self, buf):
+        """Parse a given byte string into the columns of this LppRecords.
+
+        Return the number of items. Raise BufferError if `buf` is invalid
+        or exceeds the capacity, and ValueError for an unknown type, in
+        which case `count` is 0.
+        """
+        self.count = 0
+        width = self.width
+        n = 0
+        for i, chn, lpp_type in LppFrame.walk(buf):
+            if n == self.capacity:
+                raise BufferError("Records capacity exceeded!")
+            if lpp_type.dimension > width:
+                raise ValueError("Type dimension exceeds records width!")
+            self.dims[n] = lpp_type.decode_into(buf, i + 2, self.values,
+                                                n * width)
+            self.channels[n] = chn
+            self.types[n] = lpp_type.type
+            n += 1
+        self.count = n
+        return n
+
+    def value(self, index):
+        """Return the values of the item at given index as tuple."""
+        if not 0 <= index < self.count:
+            raise IndexError("Record index out of range!")
+        pos = index * self.width
+        return tuple(self.values[pos:(pos + self.dims[index])])
+
+    def items(self):
+        """Return list of `(channel, type, value)` tuples of all items."""
+        return [(self.channels[i], self.types[i], self.value(i))
+                for i in range(self.count)]
@@ -0,0 +1,101 @@
+from .lpp_data import LppData
+from .lpp_type import LppType
+
+
+class LppStreamDecoder(object):
+    """An incremental decoder for a stream of LPP data items.
+
+    A LppStreamDecoder parses concatenated LppData items from a byte
+    stream delivered in arbitrary chunks, i.e. without frame boundaries.
+    Only the bytes of a partial trailing item are kept between chunks,
+    hence memory usage is constant regardless of the stream length.
+
+    Attributes:
+        position (int): number of bytes of all items returned so far
+        pending (int):  number of bytes of a partial trailing item
+    """
+
+    def __init__(self):
+        """Create a LppStreamDecoder object with empty state."""
+        self._tail = bytearray()
+        self.position = 0
+
+    @staticmethod
+    def __item_size(type_):
+        """Internal helper to return the byte size of a LppData item."""
+        lpp_type = LppType.get_lpp_type(type_)
+        if lpp_type is None:
+            raise ValueError("Invalid LPP data type!")
+        return lpp_type.size + 2
+
+    @property
+    def pending(self):
+        """Return the number of bytes of a partial trailing item."""
+        return len(self._tail)
+
+    def reset(self):
+        """Reset the decoder by dropping any partial trailing item."""
+        self._tail = bytearray()
+        self.position = 0
+
+    def feed(self, chunk):
+        """Feed a chunk of bytes and return the list of completed items.
+
+        Each byte is parsed only once, a partial item at the end of the
+        chunk is kept until completed by the following chunk(s). Raise
+        ValueError on an unknown type, the stream cannot be resynchronised
+        afterwards and the decoder should be reset. The items completed
+        before the unknown type are returned as `items` attribute of the
+        ValueError, and are included in `position`.
+        """
+        items = []
+        try:
+            self.__feed(chunk, items)
+        except ValueError as exc:
+            exc.items = items
+            raise
+        return items
+
+    def __feed(self, chunk, items):
+        """Internal helper to parse a chunk and append completed items."""
+        pos = 0
+        end = len(chunk)
+        tail = self._tail
+        if tail:
+            if len(tail) < 2:
+                pos = min(2 - len(tail), end)
+                tail.extend(chunk[:pos])
+            if len(tail) >= 2:
+                need = self.__item_size(tail[1]) - len(tail)
+                take = min(need, end - pos)
+                tail.extend(chunk[pos:(pos + take)])
+                pos += take
+                if take == need:
+                    items.append(LppData.from_bytes(tail))
+                    self.position += len(tail)
+                    self._tail = tail = bytearray()
+        while end - pos >= 2:
+            size = self.__item_size(chunk[pos + 1])
+            if end - pos < size:
+                break
+            items.append(LppData.from_bytes(chunk, pos))
+            pos += size
+            self.position += size
+        if pos < end:
+            tail.extend(chunk[pos:])
+
+    def decode(self, chunks):
+        """Feed an iterable of chunks and yield LppData items one by one.
+
+        On an unknown type, the items completed before it are yielded and
+        the ValueError is raised afterwards.
+        """
+        for chunk in chunks:
+            try:
+                items = self.feed(chunk)
+            except ValueError as exc:
+                for item in exc.items:
+                    yield item
+                raise
+            for item in items:
+                yield item
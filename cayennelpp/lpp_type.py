@@ -1,19 +1,97 @@
+import struct
+
+
+class LppField(object):
+    """A compiled value field of a LppType.
+
+    LppField objects are shared by all users of a LppType and immutable.
+
+    Attributes:
+        size (int):     byte size of the encoded value
+        scale (int):    scaling of the value
+        signed (bool):  signedness of the value
+        offset (int):   byte offset of the value within its LppType
+        limit (int):    exclusive upper bound of the encoded integer
+        mask (int):     bit mask of the encoded integer
+        fmt (str):      struct format to encode the value, 3 byte values
+                        are split into a 1 and 2 byte integer
+    """
+
+    __slots__ = ('size', 'scale', 'signed', 'offset', 'limit', 'mask', 'fmt')
+
+    def __init__(self, size, scale, signed, offset, fmt):
+        """Create a LppField object with given attributes."""
+        init = object.__setattr__
+        init(self, 'size', size)
+        init(self, 'scale', scale)
+        init(self, 'signed', signed)
+        init(self, 'offset', offset)
+        init(self, 'limit', 1 << (size * 8))
+        init(self, 'mask', self.limit - 1)
+        init(self, 'fmt', fmt)
+
+    def __setattr__(self, name, value):
+        """Prevent any change of this shared LppField."""
+        raise AttributeError('LppField objects are immutable!')
+
+    def __delattr__(self, name):
+        """Prevent any change of this shared LppField."""
+        raise AttributeError('LppField objects are immutable!')
+
+    def to_raw(self, value):
+        """Check, scale, and mask a value into an unsigned integer."""
+        if not self.signed and value < 0:
+            raise ValueError('Invalid data, must be non negative!')
+        value = int(value * self.scale)
+        if value >= self.limit:
+            raise ValueError('Invalid data, exceed value range!')
+        return value & self.mask
+
+    def check_raw(self, value):
+        """Check and mask an unscaled integer into an unsigned integer.
+
+        Unlike `to_raw`, signed integers must fit the signed range of the
+        field, such that decoding always returns the same integers.
+        """
+        if not isinstance(value, int):
+            raise TypeError('Invalid data, must be an integer!')
+        if self.signed:
+            half = self.limit >> 1
+            if not -half <= value < half:
+                raise ValueError('Invalid data, exceed value range!')
+        elif value < 0:
+            raise ValueError('Invalid data, must be non negative!')
+        elif value >= self.limit:
+            raise ValueError('Invalid data, exceed value range!')
+        return value & self.mask
+
+
 class LppType(object):
     """Cayenne LPP type object.
 
     The LppType provides a simple wrapper to all sensor types of
     the Cayenne LPP standard (and beyond). It ensures proper
-    encoding and decoding with sensible checks. This class is for
-    internal use only and thus is not (directly) exposed.
+    encoding and decoding with sensible checks.
+
+    Each LppType compiles its sizes, scales, and signs into struct
+    formats once on creation, and all known types are created only
+    once at import. LppType objects are shared and immutable, pickling
+    refers to the registered LppType of the same ID instead of a copy.
+    Further (vendor specific) types can be added with `register_type`
+    during startup, and `freeze_types` prevents any later changes.
 
     Attributes:
         type (int): LPP type ID number
         name (str): human readable type description
-        sizes (list): byte size of values
-        scales (list): scaling of values
-        signs (list): signess of values
+        sizes (tuple): byte size of values
+        scales (tuple): scaling of values
+        signs (tuple): signess of values
     """
 
+    __slots__ = ('type', 'name', 'sizes', 'scales', 'signs', '_size', '_split',
+                 '_dec_fmt', '_enc_fmt', '_fields', '_item_fmt', '_bytewise',
+                 '_table')
+
     __lpp_types = {
         0:      ('Digital Input', [1], [1], [False]),
         1:      ('Digital Output', [1], [1], [False]),
@@ -48,6 +126,18 @@ class LppType(object):
         142:    ('Switch', [1], [1], [False])
     }
 
+    # registered LppType objects indexed by type byte
+    __lpp_registry = [None] * 256
+    # type IDs by every lower case prefix of their names
+    __lpp_prefixes = {}
+    __frozen = False
+
+    # struct formats to decode (signed) and encode (unsigned) values of a
+    # given byte size, 3 byte values are split into a 1 and 2 byte part
+    __dec_formats = {1: ('B', 'b'), 2: ('H', 'h'), 3: ('BH', 'bH'),
+                     4: ('I', 'i')}
+    __enc_formats = {1: 'B', 2: 'H', 3: 'BH', 4: 'I'}
+
     def __init__(self, type_, name, sizes, scales, signs):
         """Create a LppType object with given attributes."""
         if not isinstance(type_, int):
@@ -62,11 +152,90 @@ class LppType(object):
             raise TypeError('Parameter (signs) must be a list of integers!')
         if len(sizes) != len(scales) or len(scales) != len(signs):
             raise ValueError('Invalid parameter length: sizes, scales, signs!')
-        self.type = type_
-        self.name = name
-        self.sizes = sizes
-        self.scales = scales
-        self.signs = signs
+        for size in sizes:
+            if size not in self.__enc_formats:
+                raise ValueError('Invalid parameter value: sizes!')
+        init = object.__setattr__
+        init(self, 'type', type_)
+        init(self, 'name', name)
+        init(self, 'sizes', tuple(sizes))
+        init(self, 'scales', tuple(scales))
+        init(self, 'signs', tuple(signs))
+        self.__compile()
+
+    def __setattr__(self, name, value):
+        """Prevent any change, the codec is compiled from the attributes."""
+        raise AttributeError('LppType objects are immutable!')
+
+    def __delattr__(self, name):
+        """Prevent any change, the codec is compiled from the attributes."""
+        raise AttributeError('LppType objects are immutable!')
+
+    def __reduce__(self):
+        """Pickle this LppType by reference to its registered type ID."""
+        return (LppType._from_pickle, (self.type, self.name, self.sizes,
+                                       self.scales, self.signs))
+
+    @classmethod
+    def _from_pickle(cls, type_, name, sizes, scales, signs):
+        """Return the registered LppType of a pickled one.
+
+        A type which is not registered alike, e.g. a vendor type in a
+        process that did not register it, is created anew by value.
+        """
+        lpp_type = cls.get_lpp_type(type_)
+        if lpp_type is not None and (lpp_type.name, lpp_type.sizes,
+                                     lpp_type.scales, lpp_type.signs) == \
+                (name, sizes, scales, signs):
+            return lpp_type
+        return cls(type_, name, list(sizes), list(scales), list(signs))
+
+    def __compile(self):
+        """Internal helper to precompile the codec of this LppType."""
+        dec_fmt = '>'
+        enc_fmt = '>'
+        fields = []
+        pos = 0
+        for i in range(len(self.sizes)):
+            size = self.sizes[i]
+            dec_fmt += self.__dec_formats[size][int(bool(self.signs[i]))]
+            enc_fmt += self.__enc_formats[size]
+            fields.append(LppField(size, self.scales[i], self.signs[i], pos,
+                                   '>' + self.__enc_formats[size]))
+            pos += size
+        init = object.__setattr__
+        init(self, '_size', pos)
+        init(self, '_split', 3 in self.sizes)
+        init(self, '_dec_fmt', dec_fmt)
+        init(self, '_enc_fmt', enc_fmt)
+        init(self, '_fields', tuple(fields))
+        # type and values of an item are written with one struct call
+        init(self, '_item_fmt', '>B' + enc_fmt[1:])
+        # types of only 1 byte fields decode by table lookup, the tables
+        # are created on first use to save memory, e.g. on MicroPython
+        init(self, '_bytewise', pos == len(fields))
+        init(self, '_table', None)
+
+    def __build_table(self):
+        """Internal helper to create the decode tables of 1 byte types.
+
+        Single value types map each byte to a shared value tuple, others
+        have a table of values per field, both indexed by unsigned byte.
+        """
+        tables = []
+        for field in self._fields:
+            values = []
+            for b in range(256):
+                if field.signed and b > 0x7f:
+                    b -= 0x100
+                values.append(b / field.scale)
+            tables.append(tuple(values))
+        if len(tables) == 1:
+            table = tuple([(v,) for v in tables[0]])
+        else:
+            table = tuple(tables)
+        object.__setattr__(self, '_table', table)
+        return table
 
     def __int__(self):
         """Return LppType as integer, i.e. its numeric type."""
@@ -85,53 +254,67 @@ class LppType(object):
             raise ValueError()
         return data
 
-    @staticmethod
-    def __from_bytes(buf):
-        """Internal helper to parse a number from buffer."""
-        buflen = len(buf)
-        val = 0
-        for i in range(buflen):
-            shift = (buflen - i - 1) * 8
-            val |= buf[i] << shift
-        return val
+    @classmethod
+    def _build_registry(cls):
+        """Register the shared LppType objects of all known types."""
+        for type_, spec in cls.__lpp_types.items():
+            cls.register_type(type_, *spec)
 
-    @staticmethod
-    def __to_bytes(val, buflen):
-        """Internal helper to write a value to a buffer."""
-        buf = bytearray(buflen)
-        val = int(val)
-        for i in range(buflen):
-            shift = (buflen - i - 1) * 8
-            buf[i] = (val >> shift) & 0xff
-        return buf
+    @classmethod
+    def register_type(cls, type_, name, sizes, scales, signs):
+        """Create, register, and return a LppType with given attributes.
 
-    @staticmethod
-    def __to_signed(val, size):
-        """Internal helper to convert unsigned int to signed."""
-        mask = 0x00
-        for i in range(size):
-            mask |= 0xff << (i * 8)
-        if val >= (1 << ((size * 8) - 1)):
-            val = -1 - (val ^ mask)
-        return val
+        The type ID must be within 0 to 255 and neither the ID nor the
+        name may be registered already. Raise RuntimeError if types are
+        frozen, i.e. after `freeze_types` was called.
+        """
+        if cls.__frozen:
+            raise RuntimeError('Registered types are frozen!')
+        if not isinstance(type_, int):
+            raise TypeError('Parameter (type_) must be an integer!')
+        if not 0 <= type_ <= 0xff:
+            raise ValueError('Invalid parameter value: type_!')
+        if cls.__lpp_registry[type_] is not None:
+            raise ValueError('Type already registered: {}'.format(type_))
+        lpp_type = cls(type_, name, sizes, scales, signs)
+        for other in cls.__lpp_registry:
+            if other is not None and other.name.lower() == name.lower():
+                raise ValueError('Type already registered: ' + name)
+        cls.__lpp_registry[type_] = lpp_type
+        prefixes = cls.__lpp_prefixes
+        name = name.lower()
+        for i in range(len(name) + 1):
+            prefixes[name[:i]] = prefixes.get(name[:i], ()) + (type_,)
+        return lpp_type
 
-    @staticmethod
-    def __to_unsigned(val):
-        """Convert signed (two's complement) value to unsigned."""
-        if val < 0:
-            val = ~(-val - 1)
-        return val
+    @classmethod
+    def freeze_types(cls):
+        """Prevent any further registration of types."""
+        cls.__frozen = True
 
     @classmethod
     def get_lpp_type(cls, type_):
         """Return LppType object for given type or `None` if not found."""
         if not isinstance(type_, int):
             raise TypeError('Parameter (type_) must be an integer!')
-
-        if type_ in cls.__lpp_types:
-            return cls(type_, *cls.__lpp_types[type_])
+        if 0 <= type_ <= 0xff:
+            return cls.__lpp_registry[type_]
         return None
 
+    @classmethod
+    def get_lpp_types_by_name(cls, name):
+        """Return tuple of type IDs whose names start with given name.
+
+        The name is compared case insensitive, without any string
+        operations per type.
+        """
+        return cls.__lpp_prefixes.get(name.strip().lower(), ())
+
+    @classmethod
+    def get_lpp_types(cls):
+        """Return list of all known LppType objects ordered by type."""
+        return [t for t in cls.__lpp_registry if t is not None]
+
     @property
     def dimension(self):
         """Return number of value dimensions."""
@@ -140,40 +323,237 @@ class LppType(object):
     @property
     def size(self):
         """Return size of byte string representation."""
-        return sum(self.sizes)
+        return self._size
+
+    @property
+    def fields(self):
+        """Return tuple of the compiled LppField of each value."""
+        return self._fields
+
+    @property
+    def decode_format(self):
+        """Return the struct format to decode values, w/o byte order.
+
+        A 3 byte value is split into two integers, the integers unpacked
+        with this format are converted into values by `unpack_values`.
+        """
+        return self._dec_fmt[1:]
+
+    @property
+    def encode_format(self):
+        """Return the struct format to encode values, w/o byte order.
+
+        A 3 byte value is split into two integers, see `LppField.fmt`.
+        """
+        return self._enc_fmt[1:]
 
     def decode(self, buf):
         """Parse LppType from a byte string."""
-        if len(buf) != sum(self.sizes):
+        if len(buf) != self._size:
             raise BufferError('Invalid buffer length!')
-        data = []
-        pos = 0
-        for i in range(len(self.sizes)):
-            size = self.sizes[i]
-            value = self.__from_bytes(buf[pos:(pos + size)])
-            if self.signs[i]:
-                value = self.__to_signed(value, size)
-            value = value / self.scales[i]
-            data.append(value)
-            pos += size
-        return tuple(data)
+        return self.decode_from(buf, 0)
+
+    def decode_from(self, buf, offset=0):
+        """Parse LppType from a buffer starting at given offset."""
+        if len(buf) - offset < self._size:
+            raise BufferError('Invalid buffer length!')
+        if self._bytewise:
+            table = self._table
+            if table is None:
+                table = self.__build_table()
+            if len(self._fields) == 1:
+                return table[buf[offset]]
+            return tuple([table[i][buf[offset + i]]
+                          for i in range(len(table))])
+        raw = struct.unpack_from(self._dec_fmt, buf, offset)
+        return self.unpack_values(raw, 0)
+
+    def decode_into(self, buf, offset, out, pos=0):
+        """Parse LppType from a buffer into a given writable sequence.
+
+        The values are written into `out`, e.g. an `array.array('d')`,
+        starting at index `pos`, instead of creating a value tuple. Return
+        the number of values written, i.e. the dimension.
+        """
+        if len(buf) - offset < self._size:
+            raise BufferError('Invalid buffer length!')
+        fields = self._fields
+        if self._bytewise:
+            table = self._table
+            if table is None:
+                table = self.__build_table()
+            if len(fields) == 1:
+                out[pos] = table[buf[offset]][0]
+                return 1
+            for i in range(len(fields)):
+                out[pos + i] = table[i][buf[offset + i]]
+            return len(fields)
+        raw = struct.unpack_from(self._dec_fmt, buf, offset)
+        if not self._split:
+            for i in range(len(fields)):
+                out[pos + i] = raw[i] / fields[i].scale
+            return len(fields)
+        j = 0
+        for i in range(len(fields)):
+            if fields[i].size == 3:
+                out[pos + i] = ((raw[j] << 16) | raw[j + 1]) / fields[i].scale
+                j += 2
+            else:
+                out[pos + i] = raw[j] / fields[i].scale
+                j += 1
+        return len(fields)
+
+    def decode_raw(self, buf):
+        """Parse LppType from a byte string into unscaled integers.
+
+        Values are the sign corrected integers as encoded, i.e. the value
+        multiplied by its scale, see `scales`.
+        """
+        if len(buf) != self._size:
+            raise BufferError('Invalid buffer length!')
+        return self.decode_raw_from(buf, 0)
+
+    def decode_raw_from(self, buf, offset=0):
+        """Parse LppType from a buffer into unscaled integers."""
+        if len(buf) - offset < self._size:
+            raise BufferError('Invalid buffer length!')
+        raw = struct.unpack_from(self._dec_fmt, buf, offset)
+        if not self._split:
+            return raw
+        return self._unpack_raw(raw, 0)
+
+    def _unpack_raw(self, raw, pos):
+        """Internal helper to join split 3 byte integers."""
+        values = []
+        for field in self._fields:
+            if field.size == 3:
+                values.append((raw[pos] << 16) | raw[pos + 1])
+                pos += 2
+            else:
+                values.append(raw[pos])
+                pos += 1
+        return tuple(values)
+
+    def unpack_values(self, raw, pos=0):
+        """Convert integers unpacked with `decode_format` into values.
+
+        The `raw` integers of this LppType start at index `pos`, which
+        allows to decode from a struct covering multiple LppData items.
+        Return the tuple of values.
+        """
+        fields = self._fields
+        if self._bytewise:
+            table = self._table
+            if table is None:
+                table = self.__build_table()
+            if len(self._fields) == 1:
+                return table[raw[pos] & 0xff]
+            return tuple([table[i][raw[pos + i] & 0xff]
+                          for i in range(len(table))])
+        if not self._split:
+            if len(fields) == 1:
+                return (raw[pos] / fields[0].scale,)
+            return tuple([raw[pos + i] / fields[i].scale
+                          for i in range(len(fields))])
+        values = []
+        for field in fields:
+            if field.size == 3:
+                values.append(((raw[pos] << 16) | raw[pos + 1]) / field.scale)
+                pos += 2
+            else:
+                values.append(raw[pos] / field.scale)
+                pos += 1
+        return tuple(values)
 
     def encode(self, data):
         """Convert LppType into a byte string."""
-        data = self.__assert_data_tuple(data, len(self.sizes))
-        buf = bytearray(sum(self.sizes))
-        pos = 0
-        for i in range(len(self.sizes)):
-            size = self.sizes[i]
-            value = data[i]
-            if not self.signs[i] and value < 0:
-                raise ValueError('Invalid data, must be non negative!')
-            value = int(value * self.scales[i])
-            maxval = 1 << (size * 8)
-            if value >= maxval:
-                raise ValueError('Invalid data, exceed value range!')
-            if self.signs[i]:
-                value = self.__to_unsigned(value)
-            buf[pos:(pos + size)] = self.__to_bytes(value, size)
-            pos += size
+        buf = bytearray(self._size)
+        self.encode_into(buf, 0, data)
+        return buf
+
+    def encode_raw(self, data):
+        """Convert unscaled integers of LppType into a byte string."""
+        buf = bytearray(self._size)
+        self.encode_raw_into(buf, 0, data)
         return buf
+
+    def encode_into(self, buf, offset, data):
+        """Write LppType into a buffer starting at given offset.
+
+        Each value is written straight into `buf`, return the number of
+        bytes written. If a value is invalid, preceding values of `data`
+        may have been written already.
+        """
+        return self.__write(buf, offset, data, LppField.to_raw)
+
+    def encode_raw_into(self, buf, offset, data):
+        """Write unscaled integers of LppType into a buffer at given offset.
+
+        Integers are written as is, i.e. without scaling, see `scales`.
+        This is the exact inverse of `decode_raw_from`.
+        """
+        return self.__write(buf, offset, data, LppField.check_raw)
+
+    def __write(self, buf, offset, data, convert):
+        """Internal helper to convert and write values into a buffer.
+
+        The `convert` function is either `LppField.to_raw` or
+        `LppField.check_raw`.
+        """
+        data = self.__assert_data_tuple(data, len(self._fields))
+        for i in range(len(self._fields)):
+            field = self._fields[i]
+            value = convert(field, data[i])
+            if field.size == 3:
+                struct.pack_into(field.fmt, buf, offset + field.offset,
+                                 value >> 16, value & 0xffff)
+            else:
+                struct.pack_into(field.fmt, buf, offset + field.offset, value)
+        return self._size
+
+    def encode_item_into(self, buf, offset, channel, data):
+        """Write a LppData item, i.e. header and data, into a buffer.
+
+        The type and values are written with one precompiled struct format.
+        Return the number of bytes written.
+        """
+        return self.__write_item(buf, offset, channel, data,
+                                 LppField.to_raw)
+
+    def encode_raw_item_into(self, buf, offset, channel, data):
+        """Write a LppData item of unscaled integers into a buffer."""
+        return self.__write_item(buf, offset, channel, data,
+                                 LppField.check_raw)
+
+    def __write_item(self, buf, offset, channel, data, convert):
+        """Internal helper to write header and converted values.
+
+        The channel is stored as a byte first, which raises TypeError for
+        a non integer channel, the type and values are packed after it.
+        """
+        if not 0 <= channel <= 0xff:
+            raise ValueError('Invalid data channel!')
+        fields = self._fields
+        if not isinstance(data, tuple):
+            data = (data,)
+        if len(data) != len(fields):
+            raise ValueError("Invalid number of data values!")
+        if len(fields) == 1 and not self._split:
+            value = convert(fields[0], data[0])
+            buf[offset] = channel
+            struct.pack_into(self._item_fmt, buf, offset + 1, self.type,
+                             value)
+            return self._size + 2
+        raw = [self.type]
+        for i in range(len(fields)):
+            value = convert(fields[i], data[i])
+            if fields[i].size == 3:
+                raw += [value >> 16, value & 0xffff]
+            else:
+                raw.append(value)
+        buf[offset] = channel
+        struct.pack_into(self._item_fmt, buf, offset + 1, *raw)
+        return self._size + 2
+
+
+LppType._build_registry()
@@ -18,7 +18,8 @@ class LppUtil():
                 return obj.name
             return obj.type
         if isinstance(obj, LppData):
-            return obj.__dict__
+            return {'channel': obj.channel, 'type': obj.type,
+                    'value': obj.value}
         if isinstance(obj, LppFrame):
             return obj.data
         raise TypeError(repr(obj) + " is not JSON serialized")
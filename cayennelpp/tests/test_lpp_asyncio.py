@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cayennelpp.lpp_asyncio import LppAsyncDecoder
+from cayennelpp.lpp_frame import LppFrame
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def make_payloads(count):
+    payloads = []
+    for i in range(count):
+        frame = LppFrame()
+        frame.add_temperature(1, (i % 500) / 10)
+        frame.add_gps(2, 42.3519, -87.9094, 10.0)
+        payloads.append(bytes(frame))
+    return payloads
+
+
+async def produce(payloads):
+    for buf in payloads:
+        yield buf
+
+
+async def consume(decoder):
+    results = []
+    while True:
+        item = await decoder.output.get()
+        if item is None:
+            return results
+        results.append(item)
+
+
+async def pipeline(source, **kwargs):
+    decoder = LppAsyncDecoder(**kwargs)
+    consumer = asyncio.ensure_future(consume(decoder))
+    await decoder.run(source)
+    return decoder, await consumer
+
+
+def test_init_invalid():
+    with pytest.raises(ValueError):
+        LppAsyncDecoder(batch_size=0)
+    with pytest.raises(ValueError):
+        LppAsyncDecoder(latency=-1)
+    with pytest.raises(ValueError):
+        LppAsyncDecoder(maxsize=0)
+
+
+def test_run_async_iterator():
+    payloads = make_payloads(200)
+    decoder, frames = run(pipeline(produce(payloads), batch_size=16))
+    assert decoder.decoded == 200
+    assert decoder.failed == 0
+    assert [bytes(f) for f in frames] == payloads
+
+
+def test_run_queue():
+    payloads = make_payloads(50)
+
+    async def main():
+        queue = asyncio.Queue()
+        for buf in payloads:
+            queue.put_nowait(buf)
+        queue.put_nowait(None)
+        return await pipeline(queue, compact=True)
+
+    decoder, items = run(main())
+    assert items == list(LppFrame.decode_many(payloads, compact=True))
+
+
+def test_run_invalid_payloads():
+    payloads = make_payloads(10)
+    payloads[3] = payloads[3][:-1]
+    payloads[7] = bytes([0x01, 0xFF, 0x00])
+    errors = []
+    decoder, frames = run(pipeline(
+        produce(payloads), on_error=lambda b, e: errors.append((b, e))))
+    assert decoder.decoded == 8
+    assert decoder.failed == 2
+    assert [b for b, e in errors] == [payloads[3], payloads[7]]
+    assert isinstance(errors[0][1], BufferError)
+    assert isinstance(errors[1][1], ValueError)
+    assert len(frames) == 8
+
+
+def test_run_executor():
+    payloads = make_payloads(100)
+    with ThreadPoolExecutor(2) as executor:
+        decoder, frames = run(pipeline(
+            produce(payloads), batch_size=32, executor=executor,
+            offload_size=8))
+    assert [bytes(f) for f in frames] == payloads
+
+
+def test_run_source_error():
+    async def failing():
+        yield make_payloads(1)[0]
+        raise RuntimeError("broken source")
+
+    async def main():
+        decoder = LppAsyncDecoder()
+        consumer = asyncio.ensure_future(consume(decoder))
+        with pytest.raises(RuntimeError):
+            await decoder.run(failing())
+        return await consumer
+
+    assert len(run(main())) == 1
+
+
+def test_run_backpressure():
+    payloads = make_payloads(500)
+    produced = [0]
+
+    async def counting():
+        for buf in payloads:
+            produced[0] += 1
+            yield buf
+
+    async def main():
+        decoder = LppAsyncDecoder(batch_size=8, maxsize=4)
+        task = asyncio.ensure_future(decoder.run(counting()))
+        consumed = 0
+        while True:
+            await asyncio.sleep(0.001)
+            item = await decoder.output.get()
+            if item is None:
+                break
+            consumed += 1
+            # internal queue, one batch and the output queue at most
+            assert produced[0] - consumed <= 8 + 8 + 4 + 1
+        await task
+        return consumed
+
+    assert run(main()) == 500
+
+
+def test_event_loop_lag():
+    payloads = make_payloads(20000)
+    lags = []
+
+    async def ticker(stop):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def main():
+        stop = asyncio.Event()
+        tick = asyncio.ensure_future(ticker(stop))
+        await asyncio.sleep(0.01)
+        decoder, frames = await pipeline(produce(payloads), batch_size=32)
+        stop.set()
+        await tick
+        return frames
+
+    assert len(run(main())) == 20000
+    lags.sort()
+    assert lags[int(len(lags) * 0.99)] < 0.05
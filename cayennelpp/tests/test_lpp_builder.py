@@ -0,0 +1,109 @@
+import pytest
+
+from cayennelpp.lpp_builder import LppFrameBuilder
+from cayennelpp.lpp_frame import LppFrame
+
+
+def fill(frame):
+    frame.add_digital_input(0, 1)
+    frame.add_digital_output(1, 0)
+    frame.add_analog_input(2, -12.34)
+    frame.add_analog_output(3, 56.78)
+    frame.add_generic(4, 4294967295)
+    frame.add_luminosity(5, 12345)
+    frame.add_presence(6, 1)
+    frame.add_temperature(7, -4.1)
+    frame.add_humidity(8, 45.5)
+    frame.add_accelerometer(9, 1.234, -1.234, 0.0)
+    frame.add_pressure(10, 1005.5)
+    frame.add_voltage(11, 25.2)
+    frame.add_current(12, 16.2)
+    frame.add_frequency(13, 50)
+    frame.add_percentage(14, 99)
+    frame.add_altitude(15, -42)
+    frame.add_load(16, -5.432)
+    frame.add_concentration(17, 400)
+    frame.add_power(18, 1000)
+    frame.add_distance(19, 1.2345)
+    frame.add_energy(20, 1234.5)
+    frame.add_direction(21, 270)
+    frame.add_unix_time(22, 1600000000)
+    frame.add_gyrometer(23, 1.23, -1.23, 0.0)
+    frame.add_colour(24, 255, 128, 0)
+    frame.add_gps(25, 42.3519, -87.9094, 10.0)
+    frame.add_switch(26, 1)
+
+
+def test_builder_matches_frame():
+    frame = LppFrame()
+    fill(frame)
+    builder = LppFrameBuilder()
+    fill(builder)
+    assert len(builder) == len(frame)
+    assert builder.size == frame.size
+    assert bytes(builder) == bytes(frame)
+    assert builder.to_bytes() == frame.to_bytes()
+    assert builder.view() == bytes(frame)
+
+
+def test_builder_empty():
+    builder = LppFrameBuilder()
+    assert len(builder) == 0
+    assert bytes(builder) == b''
+    assert builder.remaining is None
+
+
+def test_builder_maxsize():
+    builder = LppFrameBuilder(maxsize=7)
+    builder.add_temperature(1, 21.5)
+    assert builder.remaining == 3
+    builder.add_digital_input(2, 1)
+    assert builder.remaining == 0
+    with pytest.raises(BufferError):
+        builder.add_digital_input(3, 1)
+    assert bytes(builder) == bytes([0x01, 0x67, 0x00, 0xd7,
+                                    0x02, 0x00, 0x01])
+    builder.reset()
+    assert builder.size == 0
+    assert len(builder) == 0
+    with pytest.raises(ValueError):
+        LppFrameBuilder(maxsize=-1)
+
+
+def test_builder_invalid_values():
+    builder = LppFrameBuilder()
+    builder.add_temperature(1, 21.5)
+    with pytest.raises(TypeError):
+        builder.add_by_type(103, 1, 21.5)
+    with pytest.raises(ValueError):
+        builder.add_by_type(999, 1, (21.5,))
+    with pytest.raises(ValueError):
+        builder.add_by_type(136, 1, (1.0, 2.0))
+    with pytest.raises(ValueError):
+        builder.add_voltage(2, -25)
+    with pytest.raises(ValueError):
+        builder.add_generic(2, 4294967296)
+    with pytest.raises(ValueError):
+        builder.add_accelerometer(2, 1.0, 1.0, 1e6)
+    with pytest.raises(ValueError):
+        builder.add_temperature(256, 21.5)
+    with pytest.raises(ValueError):
+        builder.add_gps(-1, 1.0, 2.0, 3.0)
+    with pytest.raises(TypeError):
+        builder.add_by_type('103', 1, (21.5,))
+    with pytest.raises(TypeError):
+        builder.add_temperature(1.0, 21.5)
+    with pytest.raises(TypeError):
+        builder.add_gps(1.0, 1.0, 2.0, 3.0)
+    # failed additions leave the frame untouched
+    assert len(builder) == 1
+    assert bytes(builder) == bytes([0x01, 0x67, 0x00, 0xd7])
+
+
+def test_builder_grow():
+    builder = LppFrameBuilder()
+    view = builder.view()
+    for i in range(100):
+        builder.add_gps(i, 42.3519, -87.9094, 10.0)
+    assert builder.size == 1100
+    assert len(view) == 0
@@ -0,0 +1,59 @@
+import base64
+import json
+import pytest
+
+from cayennelpp.lpp_bulk import LppBulkDecoder
+from cayennelpp.lpp_frame import LppFrame
+
+
+@pytest.fixture
+def payloads():
+    bufs = []
+    for i in range(50):
+        frame = LppFrame()
+        frame.add_temperature(1, (i % 500) / 10)
+        frame.add_digital_input(2, i % 2)
+        bufs.append(bytes(frame))
+    return bufs
+
+
+def expected(payloads):
+    return list(LppFrame.decode_many(payloads, compact=True))
+
+
+def test_init_invalid():
+    with pytest.raises(ValueError):
+        LppBulkDecoder(workers=0)
+    with pytest.raises(ValueError):
+        LppBulkDecoder(chunk_size=0)
+    with pytest.raises(ValueError):
+        LppBulkDecoder(fmt='xml')
+
+
+def test_decode_lines_hex(payloads):
+    lines = [p.hex() + "\n" for p in payloads]
+    decoder = LppBulkDecoder(workers=1, chunk_size=7)
+    assert list(decoder.decode_lines(lines)) == expected(payloads)
+
+
+def test_decode_lines_invalid():
+    lines = ["0167ffd7", "0167ff", "xyz", "01ff00", ""]
+    decoder = LppBulkDecoder(workers=1)
+    assert list(decoder.decode_lines(lines)) == \
+        [[(1, 103, (-4.1,))], None, None, None, []]
+
+
+def test_decode_lines_json(payloads):
+    lines = [json.dumps({"payload": base64.b64encode(p).decode()})
+             for p in payloads]
+    lines.append(json.dumps({"other": ""}))
+    decoder = LppBulkDecoder(workers=1, fmt='json')
+    assert list(decoder.decode_lines(lines)) == expected(payloads) + [None]
+
+
+def test_decode_file_workers(payloads, tmp_path):
+    path = tmp_path / "payloads.txt"
+    path.write_text("\n".join([base64.b64encode(p).decode()
+                               for p in payloads]) + "\n")
+    decoder = LppBulkDecoder(workers=2, chunk_size=4, fmt='base64')
+    assert list(decoder.decode_file(str(path))) == expected(payloads)
@@ -1,6 +1,6 @@
 import pytest
 
-from cayennelpp.lpp_data import LppData
+from cayennelpp.lpp_data import LppData, LppLazyData
 
 
 def test_temperature_from_bytes():
@@ -10,6 +10,21 @@ def test_temperature_from_bytes():
     assert temp_buf == bytes(temp_dat)
 
 
+def test_from_bytes_offset():
+    buf = bytes([0xAA, 0xBB, 0x01, 0x67, 0xFF, 0xD7])
+    data = LppData.from_bytes(memoryview(buf), 2)
+    assert data.channel == 1
+    assert data.value == (-4.1,)
+    assert buf[2:] == bytes(data)
+    with pytest.raises(BufferError):
+        LppData.from_bytes(buf, 4)
+
+
+def test_from_bytes_unknown_type():
+    with pytest.raises(ValueError):
+        LppData.from_bytes(bytes([0x01, 0xFF, 0x00, 0x00]))
+
+
 def test_accelerometer_from_bytes():
     # 06 71 04 D2 FB 2E 00 00
     acc_buf = bytes([0x06, 0x71, 0x04, 0xD2, 0xFB, 0x2E, 0x00, 0x00])
@@ -97,3 +112,63 @@ def test_lpp_data_size():
 
 def test_lpp_data_str():
     print(LppData(0, 0, 0))
+
+
+def test_lazy_from_bytes():
+    buf = bytes([0x01, 0x88, 0x06, 0x76, 0x5f, 0xf2, 0x96, 0x0a,
+                 0x00, 0x03, 0xe8])
+    data = LppLazyData.from_bytes(buf)
+    assert isinstance(data, LppData)
+    assert data.channel == 1
+    assert int(data.type) == 136
+    assert len(data) == len(buf)
+    assert data.value == LppData.from_bytes(buf).value
+    assert buf == bytes(data)
+
+
+def test_lazy_set_value():
+    data = LppLazyData.from_bytes(bytes([0x01, 0x67, 0xFF, 0xD7]))
+    data.value = (25.5,)
+    assert data.value == (25.5,)
+    assert bytes(data) == bytes([0x01, 0x67, 0x00, 0xff])
+
+
+def test_lazy_from_bytes_invalid():
+    with pytest.raises(BufferError):
+        LppLazyData.from_bytes(bytes([0x01, 0x67]))
+    with pytest.raises(BufferError):
+        LppLazyData.from_bytes(bytes([0x01, 0x67, 0x00]))
+    with pytest.raises(ValueError):
+        LppLazyData.from_bytes(bytes([0x01, 0xFF, 0x00]))
+
+
+def test_pack_into():
+    buf = bytes([0x01, 0x88, 0x06, 0x76, 0x5f, 0xf2, 0x96, 0x0a,
+                 0x00, 0x03, 0xe8])
+    data = LppData.from_bytes(buf)
+    out = bytearray(len(buf) + 1)
+    assert data.pack_into(out, 1) == len(buf)
+    assert out[1:] == buf
+    with pytest.raises(BufferError):
+        data.pack_into(out, 2)
+
+
+def test_pack_into_invalid_channel():
+    out = bytearray(11)
+    with pytest.raises(TypeError):
+        LppData(1.0, 103, (21.5,)).pack_into(out)
+    with pytest.raises(TypeError):
+        LppData(1.0, 136, (1.0, 2.0, 3.0)).pack_into(out)
+    with pytest.raises(ValueError):
+        LppData(256, 136, (1.0, 2.0, 3.0)).pack_into(out)
+
+
+def test_slots():
+    data = LppData(0, 0, 0)
+    assert not hasattr(data, '__dict__')
+    assert not hasattr(data.type, '__dict__')
+    assert data.type is LppData(1, 0, 1).type
+    lazy = LppLazyData.from_bytes(bytes(data))
+    assert not hasattr(lazy, '__dict__')
+    with pytest.raises(AttributeError):
+        data.foo = 42
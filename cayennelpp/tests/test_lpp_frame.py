@@ -1,9 +1,12 @@
 import pytest
 import base64
+import mmap
 from datetime import datetime
 from datetime import timezone
 
-from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_data import LppData
+from cayennelpp.lpp_frame import LppCachedFrame, LppFrame, LppVerdict
+from cayennelpp.tests.utils import traced_allocs
 
 
 @pytest.fixture
@@ -27,6 +30,10 @@ def test_empty_frame(frame):
     assert not bytes(frame)
 
 
+def test_slots(frame):
+    assert not hasattr(frame, '__dict__')
+
+
 def test_init_invalid_data_nolist():
     with pytest.raises(Exception):
         LppFrame(42)
@@ -77,6 +84,62 @@ def test_frame_maxsize_exceeded(frame):
         frame.add_generic(0, 42)
 
 
+def test_frame_size_tracking(frame_hlt):
+    assert frame_hlt.size == len(bytes(frame_hlt))
+    frame = LppFrame(frame_hlt.data, maxsize=20)
+    assert frame.size == 12
+    assert frame.remaining == 8
+    frame.add_digital_input(0, 1)
+    assert frame.size == 15
+    assert frame.remaining == 5
+    frame.reset()
+    assert frame.size == 0
+    assert frame.remaining == 20
+
+
+def test_frame_data_modified(frame_hlt):
+    frame_hlt.get_by_type(103)
+    frame_hlt.data.append(LppData(2, 103, (3.0,)))
+    assert frame_hlt.size == 16
+    assert bytes(frame_hlt)[-4:] == bytes([0x02, 0x67, 0x00, 0x1E])
+    assert len(frame_hlt.get_by_type(103)) == 2
+    del frame_hlt.data[0]
+    assert frame_hlt.size == 13
+    assert len(bytes(frame_hlt)) == 13
+    assert frame_hlt.get_by_type(104) == []
+    frame_hlt.data.clear()
+    assert frame_hlt.size == 0
+    assert frame_hlt.try_add(LppData(1, 0, (1,)))
+    assert bytes(frame_hlt) == bytes([0x01, 0x00, 0x01])
+
+
+def test_frame_remaining_unlimited(frame):
+    assert frame.remaining is None
+
+
+def test_frame_try_add(frame):
+    frame.maxsize = 7
+    assert frame.try_add_by_type(103, 1, (21.5,))
+    assert frame.try_add_by_type(0, 2, (1,))
+    assert not frame.try_add_by_type(0, 3, (1,))
+    assert frame.size == 7
+    assert len(frame) == 2
+    frame.maxsize = 11
+    data = frame.data[0]
+    assert frame.try_add(data)
+    assert not frame.try_add(data)
+    assert len(frame) == 3
+
+
+def test_frame_try_add_invalid(frame):
+    with pytest.raises(TypeError):
+        frame.try_add(42)
+    with pytest.raises(TypeError):
+        frame.try_add_by_type(103, 1, 21.5)
+    with pytest.raises(ValueError):
+        frame.try_add_by_type(999, 1, (21.5,))
+
+
 def test_frame_from_bytes():
     # 03 67 01 10 05 67 00 FF = 27.2C + 25.5C
     buf = bytes([0x03, 0x67, 0x01, 0x10, 0x05, 0x67, 0x00, 0xff])
@@ -111,6 +174,187 @@ def test_frame_from_bytes_base64():
     assert len(frame) == 2
 
 
+def test_frame_from_bytes_buffer_types():
+    buf = bytes([0x03, 0x67, 0x01, 0x10, 0x05, 0x67, 0x00, 0xff,
+                 0x01, 0x88, 0x06, 0x76, 0x5f, 0xf2, 0x96, 0x0a,
+                 0x00, 0x03, 0xe8])
+    mm = mmap.mmap(-1, len(buf))
+    mm.write(buf)
+    for b in [buf, bytearray(buf), memoryview(buf), mm]:
+        frame = LppFrame.from_bytes(b)
+        assert len(frame) == 3
+        assert buf == bytes(frame)
+    mm.close()
+
+
+def test_frame_from_bytes_truncated():
+    buf = bytes([0x03, 0x67, 0x01, 0x10, 0x05, 0x67, 0x00])
+    with pytest.raises(BufferError):
+        LppFrame.from_bytes(buf)
+
+
+def test_frame_from_bytes_lazy(frame_hlt):
+    buf = bytearray(bytes(frame_hlt))
+    frame = LppFrame.from_bytes(buf, lazy=True)
+    buf[:] = bytes(len(buf))
+    assert len(frame) == 3
+    assert [int(d.type) for d in frame] == [104, 122, 103]
+    assert len(frame.get_by_type(122)) == 1
+    assert len(frame.get_by_name("Temperature")) == 1
+    eager = LppFrame.from_bytes(bytes(frame_hlt))
+    assert [d.value for d in frame] == [d.value for d in eager]
+    assert bytes(frame) == bytes(frame_hlt)
+
+
+def test_frame_from_bytes_lazy_truncated(frame_hlt):
+    with pytest.raises(BufferError):
+        LppFrame.from_bytes(bytes(frame_hlt)[:-1], lazy=True)
+
+
+def test_frame_decode_many():
+    bufs = [bytes([0x03, 0x67, 0x01, 0x10, 0x05, 0x67, 0x00, 0xff]),
+            bytes([0x01, 0x67, 0xFF, 0xD7]),
+            bytes()]
+    frames = list(LppFrame.decode_many(bufs))
+    assert len(frames) == 3
+    for buf, frame in zip(bufs, frames):
+        assert buf == bytes(frame)
+    items = list(LppFrame.decode_many(bufs, compact=True))
+    assert items == [[(3, 103, (27.2,)), (5, 103, (25.5,))],
+                     [(1, 103, (-4.1,))],
+                     []]
+
+
+def test_frame_decode_many_lazy():
+    results = LppFrame.decode_many(iter([bytes([0x01, 0x67, 0xFF, 0xD7]),
+                                         bytes([0x01, 0x67, 0xFF])]))
+    assert len(next(results)) == 1
+    with pytest.raises(BufferError):
+        next(results)
+
+
+def test_frame_decode_many_invalid_type():
+    with pytest.raises(ValueError):
+        list(LppFrame.decode_many([bytes([0x01, 0xFF, 0x00])]))
+
+
+def test_frame_decode_many_not_strict():
+    bufs = [bytes([0x01, 0x67, 0xFF]),
+            bytes([0x01, 0x67, 0xFF, 0xD7]),
+            bytes([0x01, 0xFF, 0x00])]
+    results = list(LppFrame.decode_many(bufs, compact=True, strict=False))
+    assert isinstance(results[0], BufferError)
+    assert results[1] == [(1, 103, (-4.1,))]
+    assert isinstance(results[2], ValueError)
+
+
+def test_frame_pack_into(frame_hlt):
+    buf = bytearray(frame_hlt.size + 4)
+    assert frame_hlt.pack_into(buf, 2) == frame_hlt.size
+    assert buf[2:-2] == bytes(frame_hlt)
+    assert frame_hlt.pack_into(memoryview(buf)[4:]) == frame_hlt.size
+    assert buf[4:] == bytes(frame_hlt)
+    with pytest.raises(BufferError):
+        frame_hlt.pack_into(buf, 5)
+
+
+def test_frame_pack_into_allocations(frame):
+    for i in range(20):
+        frame.add_temperature(i, -12.3)
+        frame.add_gps(i, 42.3519, -87.9094, 10.0)
+    buf = bytearray(frame.size)
+    retained, peak = traced_allocs(frame.pack_into, buf)
+    # the 300 bytes of 40 items are written straight into the caller's
+    # buffer, no intermediate bytes object of the frame is created
+    assert retained == 0
+    assert peak < 512
+
+
+def test_walk(frame_hlt):
+    buf = bytes(frame_hlt)
+    headers = [(i, chn, int(t)) for i, chn, t in LppFrame.walk(buf)]
+    assert headers == [(0, 3, 104), (3, 1, 122), (8, 2, 103)]
+    assert list(LppFrame.walk(bytes())) == []
+    assert len(list(LppFrame.walk(memoryview(buf)))) == 3
+    with pytest.raises(BufferError):
+        list(LppFrame.walk(buf[:-1]))
+    with pytest.raises(BufferError):
+        list(LppFrame.walk(buf + bytes([0x01, 0x67])))
+    with pytest.raises(ValueError):
+        list(LppFrame.walk(buf + bytes([0x01, 0xFF, 0x00])))
+
+
+def test_decode_raw(frame_hlt):
+    buf = bytes(frame_hlt)
+    items = LppFrame.decode_raw(buf)
+    assert items == [(3, 104, (91,), (2,)), (1, 122, (160987,), (1000,)),
+                     (2, 103, (123,), (10,))]
+    assert LppFrame.encode_raw(items) == buf
+    assert LppFrame.encode_raw([(i[0], i[1], i[2]) for i in items]) == buf
+    assert LppFrame.decode_raw(bytes()) == []
+    with pytest.raises(BufferError):
+        LppFrame.decode_raw(buf[:-1])
+    with pytest.raises(BufferError):
+        LppFrame.decode_raw(buf + bytes([0x01]))
+    with pytest.raises(ValueError):
+        LppFrame.decode_raw(bytes([0x01, 0xFF, 0x00]))
+
+
+def test_encode_raw_invalid():
+    with pytest.raises(ValueError):
+        LppFrame.encode_raw([(1, 999, (1,))])
+    with pytest.raises(ValueError):
+        LppFrame.encode_raw([(256, 103, (1,))])
+    with pytest.raises(TypeError):
+        LppFrame.encode_raw([(1, 103, (1.5,))])
+    with pytest.raises(ValueError):
+        LppFrame.encode_raw([(1, 103, (40000,))])
+    with pytest.raises(ValueError):
+        LppFrame.encode_raw([(1, 103, (-70000,))])
+
+
+def test_validate(frame_hlt):
+    buf = bytes(frame_hlt)
+    verdict = LppFrame.validate(buf)
+    assert verdict
+    assert verdict.valid
+    assert verdict.count == 3
+    assert verdict.size == len(buf)
+    assert verdict.offset is None
+    assert verdict.reason is None
+    assert LppFrame.validate(bytes()).count == 0
+    assert LppFrame.validate(memoryview(buf)).valid
+
+
+def test_validate_invalid(frame_hlt):
+    buf = bytes(frame_hlt)
+    cases = [(buf[:-1], 8, LppVerdict.TRUNCATED_VALUE),
+             (buf + bytes([0x01, 0x67]), 12, LppVerdict.TRUNCATED_HEADER),
+             (buf[:3] + bytes([0x01, 0xFF, 0x00]), 3, LppVerdict.UNKNOWN_TYPE)]
+    for data, offset, reason in cases:
+        verdict = LppFrame.validate(data)
+        assert not verdict
+        assert verdict.offset == offset
+        assert verdict.size == offset
+        assert verdict.reason == reason
+        assert reason in str(verdict)
+        with pytest.raises((BufferError, ValueError)):
+            LppFrame.from_bytes(data)
+    assert LppFrame.validate(buf[:-1]).count == 2
+
+
+def test_validate_allocations():
+    frame = LppFrame()
+    for i in range(20):
+        frame.add_gps(i, 42.3519, -87.9094, 10.0)
+    buf = bytes(frame) + bytes([0x01, 0xFF, 0x00])
+    retained, peak = traced_allocs(LppFrame.validate, buf)
+    # items are only checked, not decoded, hence the header walk, the error
+    # of the truncated last item and its verdict exist once per call
+    assert retained == 0
+    assert peak < 1536
+
+
 def test_add_digital_io(frame):
     frame.add_digital_input(0, 21)
     frame.add_digital_output(1, 42)
@@ -342,8 +586,125 @@ def test_get_by_name(frame_hlt):
     assert len(b_list) == 0
 
 
+def test_get_by_name_prefix(frame):
+    frame.add_analog_output(1, 1.0)
+    frame.add_temperature(2, 1.0)
+    frame.add_analog_input(3, 1.0)
+    frame.add_analog_output(4, 1.0)
+    assert [d.channel for d in frame.get_by_name(" analog")] == [1, 3, 4]
+    assert [d.channel for d in frame.get_by_name("ANALOG O")] == [1, 4]
+    assert len(frame.get_by_name("")) == 4
+    assert frame.get_by_name("foo") == []
+
+
+def test_get_by_channel(frame):
+    frame.add_temperature(1, 1.0)
+    frame.add_humidity(2, 50.0)
+    frame.add_temperature(1, 2.0)
+    frame.add_humidity(1, 60.0)
+    assert [d.value for d in frame.get_by_channel(1)] == \
+        [(1.0,), (2.0,), (60.0,)]
+    assert [d.value for d in frame.get_by_channel(1, 103)] == \
+        [(1.0,), (2.0,)]
+    assert frame.get_by_channel(2, 103) == []
+    assert frame.get_by_channel(3) == []
+
+
+def test_get_by_index_invalidated(frame):
+    frame.add_temperature(1, 1.0)
+    assert len(frame.get_by_type(103)) == 1
+    # returned lists are copies and do not affect the index
+    frame.get_by_type(103).clear()
+    assert len(frame.get_by_channel(1)) == 1
+    frame.add_temperature(1, 2.0)
+    assert len(frame.get_by_type(103)) == 2
+    assert len(frame.get_by_channel(1, 103)) == 2
+    assert len(frame.get_by_name("temperature")) == 2
+    frame.reset()
+    assert frame.get_by_type(103) == []
+    assert frame.get_by_channel(1) == []
+    lazy = LppFrame.from_bytes(bytes([0x01, 0x67, 0x00, 0xff]), lazy=True)
+    assert lazy.get_by_channel(1, 103)[0].value == (25.5,)
+
+
 def test_get_by_type_invalid(frame_hlt):
     p_list = frame_hlt.get_by_type(102)
     assert len(p_list) == 0
     i_list = frame_hlt.get_by_type(666)
     assert len(i_list) == 0
+
+
+@pytest.fixture
+def cached(frame_hlt):
+    return LppCachedFrame(frame_hlt.data)
+
+
+def test_cached_frame_bytes(cached, frame_hlt):
+    buf = bytes(cached)
+    assert buf == bytes(frame_hlt)
+    assert bytes(cached) is buf
+    assert cached.to_bytes() is buf
+    out = bytearray(len(buf) + 1)
+    assert cached.pack_into(out, 1) == len(buf)
+    assert out[1:] == buf
+
+
+def test_cached_frame_set_value(cached, frame_hlt):
+    buf = bytes(cached)
+    cached.set_value(2, 103, -4.1)
+    patched = bytes(cached)
+    assert patched[:-2] == buf[:-2]
+    assert patched[-2:] == bytes([0xFF, 0xD7])
+    assert cached.get_by_type(103)[0].value == (-4.1,)
+    assert bytes(cached) is patched
+    expected = LppFrame()
+    expected.add_humidity(3, 45.6)
+    expected.add_load(1, 160.987)
+    expected.add_temperature(2, -4.1)
+    assert patched == bytes(expected)
+    # items shared with the original frame are left unchanged
+    assert bytes(frame_hlt) == buf
+    assert frame_hlt.get_by_type(103)[0].value == (12.3,)
+
+
+def test_cached_frame_set_value_invalid(cached):
+    buf = bytes(cached)
+    with pytest.raises(KeyError):
+        cached.set_value(9, 103, 1.0)
+    with pytest.raises(ValueError):
+        cached.set_value(3, 104, -1.0)
+    with pytest.raises(ValueError):
+        cached.set_value(2, 103, (1.0, 2.0))
+    assert bytes(cached) == buf
+
+
+def test_cached_frame_mutation(cached):
+    buf = bytes(cached)
+    cached.add_digital_input(4, 1)
+    assert bytes(cached) == buf + bytes([0x04, 0x00, 0x01])
+    cached.set_value(4, 0, 0)
+    assert bytes(cached) == buf + bytes([0x04, 0x00, 0x00])
+    cached.reset()
+    assert bytes(cached) == b''
+    with pytest.raises(KeyError):
+        cached.set_value(4, 0, 1)
+
+
+def test_cached_frame_data_modified(cached):
+    buf = bytes(cached)
+    cached.data.append(LppData(4, 0, (1,)))
+    assert bytes(cached) == buf + bytes([0x04, 0x00, 0x01])
+    cached.set_value(4, 0, 0)
+    assert bytes(cached) == buf + bytes([0x04, 0x00, 0x00])
+    cached.data.pop()
+    out = bytearray(len(buf))
+    assert cached.pack_into(out) == len(buf)
+    assert out == buf
+
+
+def test_cached_frame_from_bytes(frame_hlt):
+    cached = LppCachedFrame.from_bytes(bytes(frame_hlt), lazy=True)
+    assert isinstance(cached, LppCachedFrame)
+    cached.set_value(1, 122, 1.5)
+    assert cached.get_by_type(122)[0].value == (1.5,)
+    assert bytes(LppFrame.from_bytes(bytes(cached))) == bytes(cached)
@@ -0,0 +1,150 @@
+import pytest
+
+from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_layout import LppLayout, LppLayoutCache, LppSchema
+
+
+@pytest.fixture
+def buf():
+    frame = LppFrame()
+    frame.add_temperature(1, -12.3)
+    frame.add_humidity(2, 45.5)
+    frame.add_gps(3, 42.3519, -87.9094, 10.0)
+    frame.add_load(4, -5.432)
+    return bytes(frame)
+
+
+def test_layout_init():
+    layout = LppLayout([(1, 103), (2, 104), (3, 136)])
+    assert len(layout) == 3
+    assert layout.size == 4 + 3 + 11
+    assert layout.headers == ((1, 103), (2, 104), (3, 136))
+
+
+def test_layout_init_invalid():
+    with pytest.raises(ValueError):
+        LppLayout([(1, 999)])
+    with pytest.raises(ValueError):
+        LppLayout([(256, 103)])
+
+
+def test_layout_from_bytes(buf):
+    layout = LppLayout.from_bytes(buf)
+    assert layout.headers == ((1, 103), (2, 104), (3, 136), (4, 122))
+    assert layout.size == len(buf)
+    with pytest.raises(BufferError):
+        LppLayout.from_bytes(buf[:-1])
+    with pytest.raises(ValueError):
+        LppLayout.from_bytes(bytes([0x01, 0xFF, 0x00]))
+
+
+def test_layout_decode(buf):
+    layout = LppLayout.from_bytes(buf)
+    frame = layout.decode(buf)
+    assert bytes(frame) == buf
+    expected = [(d.channel, int(d.type), d.value)
+                for d in LppFrame.from_bytes(buf)]
+    assert layout.decode(buf, compact=True) == expected
+
+
+def test_layout_decode_mismatch(buf):
+    layout = LppLayout.from_bytes(buf)
+    other = bytearray(buf)
+    other[0] = 9
+    with pytest.raises(ValueError):
+        layout.decode(other)
+    with pytest.raises(ValueError):
+        layout.decode(buf + buf)
+
+
+def test_cache_hits_misses(buf):
+    cache = LppLayoutCache(maxsize=2)
+    for _ in range(3):
+        assert bytes(cache.decode(buf)) == buf
+    assert cache.misses == 1
+    assert cache.hits == 2
+    assert len(cache) == 1
+    other = bytearray(buf)
+    other[2] = 9
+    assert bytes(cache.decode(other)) == bytes(other)
+    assert cache.hits == 3
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_cache_mismatch_fallback(buf):
+    cache = LppLayoutCache()
+    cache.decode(buf)
+    other = bytearray(buf)
+    other[4] = 7
+    assert bytes(cache.decode(other)) == bytes(other)
+    assert cache.misses == 2
+    assert len(cache) == 1
+
+
+def test_cache_eviction():
+    cache = LppLayoutCache(maxsize=2)
+    bufs = [bytes([i, 0x67, 0x00, 0xff]) for i in range(3)]
+    for b in bufs:
+        cache.decode(b)
+    assert len(cache) == 2
+    cache.decode(bufs[0])
+    assert cache.misses == 4
+
+
+def test_cache_compact_and_empty(buf):
+    cache = LppLayoutCache()
+    assert cache.decode(buf, compact=True) == \
+        LppLayout.from_bytes(buf).decode(buf, compact=True)
+    assert cache.decode(bytes(), compact=True) == []
+    frame = cache.decode(bytes())
+    assert isinstance(frame, LppFrame)
+    assert len(frame) == 0
+    assert cache.misses == 3
+    with pytest.raises(BufferError):
+        cache.decode(bytes([0x01]))
+    with pytest.raises(ValueError):
+        LppLayoutCache(0)
+
+
+@pytest.fixture
+def schema():
+    return LppSchema([(1, 103), (2, 104), (3, 136), (4, 122)])
+
+
+def test_schema_encode(schema, buf):
+    values = (-12.3, 45.5, 42.3519, -87.9094, 10.0, -5.432)
+    assert schema.dimension == 6
+    assert schema.encode(values) == buf
+    assert schema.encode(list(values)) == buf
+    out = bytearray(len(buf) + 2)
+    assert schema.encode_into(out, 2, values) == len(buf)
+    assert out[2:] == buf
+    with pytest.raises(BufferError):
+        schema.encode_into(out, 3, values)
+
+
+def test_schema_decode(schema, buf):
+    values = schema.decode_values(buf)
+    expected = ()
+    for d in LppFrame.from_bytes(buf):
+        expected += d.value
+    assert values == expected
+    assert schema.encode(values) == buf
+    assert bytes(schema.decode(buf)) == buf
+    other = bytearray(buf)
+    other[1] = 0x68
+    with pytest.raises(ValueError):
+        schema.decode_values(other)
+
+
+def test_schema_encode_invalid(schema):
+    with pytest.raises(ValueError):
+        schema.encode((1.0, 2.0))
+    with pytest.raises(ValueError):
+        schema.encode((-12.3, -45.5, 42.3519, -87.9094, 10.0, -5.432))
+    with pytest.raises(ValueError):
+        schema.encode((-12.3, 45.5, 42.3519, -87.9094, 10.0, 1e9))
+    with pytest.raises(ValueError):
+        LppSchema([(1, 999)])
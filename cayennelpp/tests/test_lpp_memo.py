@@ -0,0 +1,83 @@
+import pytest
+import sys
+
+from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_memo import LppMemoDecoder
+
+
+@pytest.fixture
+def buf():
+    frame = LppFrame()
+    frame.add_temperature(1, -12.3)
+    frame.add_humidity(2, 45.5)
+    frame.add_gps(3, 42.3519, -87.9094, 10.0)
+    return bytes(frame)
+
+
+def test_memo_init_invalid():
+    with pytest.raises(ValueError):
+        LppMemoDecoder(0)
+
+
+def test_memo_decode(buf):
+    memo = LppMemoDecoder()
+    assert memo.hit_rate == 0.0
+    frame = memo.decode(buf)
+    assert bytes(frame) == buf
+    assert bytes(memo.decode(bytearray(buf))) == buf
+    assert memo.decode_compact(memoryview(buf)) == \
+        tuple(next(LppFrame.decode_many([buf], compact=True)))
+    assert memo.misses == 1
+    assert memo.hits == 2
+    assert memo.hit_rate == pytest.approx(2 / 3)
+    assert len(memo) == 1
+
+
+def test_memo_results_not_shared(buf):
+    memo = LppMemoDecoder()
+    frame = memo.decode(buf)
+    assert frame.size == len(buf)
+    assert frame.data[0] is not memo.decode(buf).data[0]
+    assert frame.get_by_type(104)[0].value == (45.5,)
+    frame.data[0].value = (25.0,)
+    frame.add_temperature(4, 1.0)
+    assert bytes(memo.decode(buf)) == buf
+    items = memo.decode_compact(buf)
+    assert isinstance(items, tuple)
+    assert memo.decode_compact(buf) is items
+
+
+def test_memo_invalid_not_cached():
+    memo = LppMemoDecoder()
+    with pytest.raises(BufferError):
+        memo.decode(bytes([0x01, 0x67, 0x00]))
+    with pytest.raises(ValueError):
+        memo.decode(bytes([0x01, 0xFF, 0x00]))
+    assert len(memo) == 0
+    assert memo.misses == 2
+
+
+def test_memo_eviction_and_stats():
+    memo = LppMemoDecoder(maxsize=2)
+    bufs = [bytes([i, 0x67, 0x00, 0xff]) for i in range(3)]
+    for b in bufs:
+        memo.decode(b)
+    assert len(memo) == 2
+    nbytes = memo.nbytes
+    # two entries of a 4 byte key and one item of a single value
+    size = sys.getsizeof(bufs[0]) + sys.getsizeof((0, 0)) + \
+        sys.getsizeof((0,)) + sys.getsizeof((0, 0, 0)) + \
+        sys.getsizeof((0.0,))
+    assert nbytes == 2 * size
+    memo.decode(bufs[0])
+    assert memo.misses == 4
+    assert memo.nbytes == nbytes
+    stats = memo.stats()
+    assert stats['entries'] == 2
+    assert stats['maxsize'] == 2
+    assert stats['hits'] == 0
+    assert stats['nbytes'] == nbytes
+    memo.clear()
+    assert len(memo) == 0
+    assert memo.nbytes == 0
+    assert memo.misses == 0
@@ -0,0 +1,147 @@
+import pytest
+
+from cayennelpp.lpp_frame import LppFrame
+
+np = pytest.importorskip("numpy")
+LppNumpy = pytest.importorskip("cayennelpp.lpp_numpy").LppNumpy
+
+
+@pytest.fixture
+def payloads():
+    bufs = []
+    for i in range(16):
+        frame = LppFrame()
+        frame.add_temperature(1, -20.0 + i * 3.3)
+        frame.add_humidity(2, 30 + i)
+        frame.add_gps(3, 42.3519 - i, -87.9094 + i, 10.0 * i - 50)
+        frame.add_load(4, 0.5 - i)
+        frame.add_generic(5, 4294967295 - i)
+        bufs.append(bytes(frame))
+    return bufs
+
+
+def test_decode_list(payloads):
+    columns = LppNumpy.decode(payloads)
+    assert len(columns) == 7
+    for i, buf in enumerate(payloads):
+        for d in LppFrame.from_bytes(buf):
+            for dim in range(len(d.value)):
+                col = columns[(d.channel, int(d.type), dim)]
+                assert col.dtype == np.float64
+                assert col[i] == d.value[dim]
+
+
+def test_decode_array(payloads):
+    arr = np.frombuffer(b''.join(payloads), dtype=np.uint8)
+    arr = arr.reshape(len(payloads), -1)
+    columns = LppNumpy.decode(arr)
+    expected = LppNumpy.decode(payloads)
+    assert columns.keys() == expected.keys()
+    for key in columns:
+        assert (columns[key] == expected[key]).all()
+
+
+def test_decode_layout_mismatch(payloads):
+    buf = bytearray(payloads[0])
+    buf[0] = 9
+    with pytest.raises(ValueError):
+        LppNumpy.decode(payloads + [bytes(buf)])
+    with pytest.raises(ValueError):
+        LppNumpy.decode(payloads + [payloads[0][:-1]])
+
+
+def test_decode_invalid():
+    with pytest.raises(ValueError):
+        LppNumpy.decode([])
+    with pytest.raises(ValueError):
+        LppNumpy.decode(np.zeros(4, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        LppNumpy.decode([bytes([0x01, 0xFF, 0x00])])
+    with pytest.raises(BufferError):
+        LppNumpy.decode([bytes([0x01, 0x67, 0x00])])
+    # items of the same channel and type would share one column
+    with pytest.raises(ValueError):
+        LppNumpy.decode([bytes([0x01, 0x67, 0x00, 0x01,
+                                0x01, 0x67, 0x00, 0x02])])
+
+
+HEADERS = [(1, 103), (2, 104), (3, 136), (4, 122), (5, 100)]
+
+
+def test_encode_roundtrip(payloads):
+    columns = LppNumpy.decode(payloads)
+    arr, invalid = LppNumpy.encode(HEADERS, columns)
+    assert arr.dtype == np.uint8
+    assert arr.shape == (len(payloads), len(payloads[0]))
+    assert len(invalid) == 0
+    assert [row.tobytes() for row in arr] == payloads
+    bufs, _ = LppNumpy.encode(HEADERS, columns, as_bytes=True)
+    assert bufs == payloads
+
+
+def test_encode_matches_frame():
+    rng = np.random.default_rng(42)
+    count = 500
+    columns = {
+        (1, 103, 0): rng.uniform(-3000, 3000, count),
+        (2, 104, 0): rng.uniform(0, 120, count),
+        (3, 136, 0): rng.uniform(-90, 90, count),
+        (3, 136, 1): rng.uniform(-180, 180, count),
+        (3, 136, 2): rng.uniform(-1000, 9000, count),
+        (4, 122, 0): rng.uniform(-8000, 8000, count),
+        (5, 100, 0): rng.integers(0, 1 << 32, count),
+    }
+    bufs, invalid = LppNumpy.encode(HEADERS, columns, as_bytes=True)
+    assert len(invalid) == 0
+    for i in range(count):
+        frame = LppFrame()
+        for chn, type_ in HEADERS:
+            dims = 3 if type_ == 136 else 1
+            frame.add_by_type(type_, chn, tuple(
+                [columns[(chn, type_, d)][i].item() for d in range(dims)]))
+        assert bufs[i] == frame.to_bytes()
+
+
+def test_encode_invalid_rows():
+    columns = {(1, 116, 0): np.array([3.3, -0.01, 655.36, 655.35, np.nan]),
+               (2, 100, 0): np.array([0, 1, 2, 1 << 32, 4])}
+    arr, invalid = LppNumpy.encode([(1, 116), (2, 100)], columns)
+    assert list(invalid) == [1, 2, 3, 4]
+    assert arr[0].tobytes() == bytes([0x01, 0x74, 0x01, 0x4a,
+                                      0x02, 0x64, 0x00, 0x00, 0x00, 0x00])
+    assert not arr[1:, 2:4].any()
+    assert (arr[:, 0] == 1).all()
+
+
+def test_encode_out_of_int64_range():
+    # values beyond the int64 range must be flagged, not wrap to zero
+    columns = {(1, 100, 0): np.array([1e20, 5.0, 2.0 ** 63, -1e20])}
+    arr, invalid = LppNumpy.encode([(1, 100)], columns, as_bytes=True)
+    assert list(invalid) == [0, 2, 3]
+    assert arr[1] == bytes([0x01, 0x64, 0x00, 0x00, 0x00, 0x05])
+    frame = LppFrame()
+    frame.add_generic(1, 1e20)
+    with pytest.raises(ValueError):
+        bytes(frame)
+    columns = {(1, 100, 0): np.array([(1 << 63) + 5, 5], dtype=np.uint64)}
+    _, invalid = LppNumpy.encode([(1, 100)], columns)
+    assert list(invalid) == [0]
+    columns = {(1, 103, 0): np.array([-(1 << 62), 1 << 62, 10],
+                                     dtype=np.int64)}
+    arr, invalid = LppNumpy.encode([(1, 103)], columns, as_bytes=True)
+    assert list(invalid) == [1]
+    frame = LppFrame()
+    frame.add_temperature(1, -(1 << 62))
+    assert arr[0] == bytes(frame)
+
+
+def test_encode_invalid_args():
+    with pytest.raises(ValueError):
+        LppNumpy.encode([(1, 103)], {})
+    with pytest.raises(ValueError):
+        LppNumpy.encode([(1, 999)], {})
+    with pytest.raises(ValueError):
+        LppNumpy.encode([(1, 103), (2, 103)],
+                        {(1, 103, 0): [1.0], (2, 103, 0): [1.0, 2.0]})
+    with pytest.raises(ValueError):
+        LppNumpy.encode([(1, 103), (1, 103)], {(1, 103, 0): [1.0]})
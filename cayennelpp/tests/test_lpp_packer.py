@@ -0,0 +1,125 @@
+import pytest
+
+from cayennelpp.lpp_data import LppData
+from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_packer import LppPacker
+
+
+def readings():
+    return [LppData(1, 136, (42.3519, -87.9094, 10.0)),  # 11 bytes
+            LppData(2, 103, (21.5,)),                     # 4 bytes
+            LppData(3, 113, (0.1, -0.2, 0.98)),           # 8 bytes
+            LppData(4, 104, (45.5,)),                     # 3 bytes
+            LppData(5, 115, (1013.2,)),                   # 4 bytes
+            LppData(6, 136, (42.3519, -87.9094, 10.0))]   # 11 bytes
+
+
+def items(frames):
+    return [(d.channel, int(d.type)) for f in frames for d in f]
+
+
+def test_packer_invalid():
+    with pytest.raises(ValueError):
+        LppPacker(2)
+    with pytest.raises(ValueError):
+        LppPacker(11, mode='best')
+    with pytest.raises(ValueError):
+        LppPacker(11, sf=13)
+    with pytest.raises(ValueError):
+        LppPacker(10).pack(readings())
+    with pytest.raises(ValueError):
+        LppPacker(11).airtime(11)
+
+
+def test_packer_modes():
+    data = readings()
+    for mode in LppPacker.modes:
+        frames = LppPacker(15, mode=mode).pack(data)
+        assert len(frames) == 3
+        assert all([isinstance(f, LppFrame) for f in frames])
+        assert all([f.size <= 15 for f in frames])
+        assert sorted(items(frames)) == sorted(items([data]))
+
+
+def test_packer_ordered_keeps_order():
+    data = readings()
+    frames = LppPacker(12, mode='ordered').pack(data)
+    assert [f.size for f in frames] == [11, 12, 7, 11]
+    assert items(frames) == items([data])
+    assert len(LppPacker(12, mode='ffd').pack(data)) == 4
+
+
+def test_packer_exact_beats_ffd():
+    # ffd packs [8, 8], [6, 6, 5], [5], but [8, 6, 5] twice fit 19 bytes
+    data = [(1, 113, (0.1, 0.2, 0.3)), (2, 113, (0.1, 0.2, 0.3)),
+            (3, 100, (1,)), (4, 100, (1,)),
+            (5, 135, (1, 2, 3)), (6, 135, (1, 2, 3))]
+    assert len(LppPacker(19, mode='ffd').pack(data)) == 3
+    frames = LppPacker(19, mode='exact').pack(data)
+    assert [f.size for f in frames] == [19, 19]
+    # with no search steps the ffd result is kept
+    assert len(LppPacker(19, mode='exact', max_steps=0).pack(data)) == 3
+
+
+def test_packer_exact_many_items():
+    # the search depth equals the number of items, far beyond the
+    # recursion limit, 51 bytes fit 17 items and 50 bytes only 16
+    data = [(i % 256, 0, (1,)) for i in range(3000)]
+    frames = LppPacker(51, mode='exact').pack(data)
+    assert len(frames) == 177
+    frames = LppPacker(50, mode='exact', max_steps=5000).pack(data)
+    assert len(frames) == 188
+    assert sum([len(f) for f in frames]) == 3000
+
+
+def test_packer_raw_readings():
+    frames = LppPacker(11).pack([(1, 103, (21.5,)), (2, 104, (45.5,))])
+    assert len(frames) == 1
+    assert bytes(frames[0]) == bytes([1, 103, 0, 215, 2, 104, 91])
+
+
+def test_packer_priority():
+    data = readings()
+    prio = {4: 10, 2: 5}
+    frames = LppPacker(15, priority=lambda d: prio.get(d.channel, 0)
+                       ).pack(data)
+    assert items(frames)[:2] == [(4, 104), (2, 103)]
+
+
+def test_packer_group():
+    data = readings() + [LppData(2, 104, (50.0,)), LppData(4, 103, (1.5,))]
+    frames = LppPacker(15, group=True).pack(data)
+    assert sorted(items(frames)) == sorted(items([data]))
+    for frame in frames:
+        channels = [d.channel for d in frame]
+        assert channels.count(2) in (0, 2)
+        assert channels.count(4) in (0, 2)
+    frames = LppPacker(22, group=lambda d: int(d.type)).pack(readings())
+    assert [len(f.get_by_type(136)) for f in frames].count(2) == 1
+
+
+def test_packer_group_too_large():
+    data = [LppData(1, 136, (1.0, 2.0, 3.0)), LppData(1, 136, (1.0, 2.0, 3.0))]
+    frames = LppPacker(11, group=True).pack(data)
+    assert [f.size for f in frames] == [11, 11]
+
+
+def test_packer_time_on_air():
+    # empty LoRaWAN uplink (13 bytes PHY payload)
+    assert LppPacker.time_on_air(0, 7) == pytest.approx(0.046336, abs=1e-6)
+    assert LppPacker.time_on_air(0, 12) == pytest.approx(1.155072, abs=1e-6)
+    packer = LppPacker(51, sf=9)
+    assert packer.airtime(11) == LppPacker.time_on_air(11, 9)
+    frame = LppFrame()
+    frame.add_temperature(1, 21.5)
+    assert packer.airtime(frame) == LppPacker.time_on_air(4, 9)
+    assert packer.airtime(frame) < packer.airtime(51)
+
+
+def test_packer_exact_airtime():
+    data = readings()
+    packer = LppPacker(15, mode='exact', sf=12)
+    frames = packer.pack(data)
+    total = sum([packer.airtime(f) for f in frames])
+    ffd = LppPacker(15, mode='ffd', sf=12).pack(data)
+    assert total <= sum([packer.airtime(f) for f in ffd])
@@ -0,0 +1,75 @@
+import pytest
+
+from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_records import LppRecords
+from cayennelpp.lpp_type import LppType
+from cayennelpp.tests.utils import traced_allocs
+
+
+def sample_value(lpp_type):
+    value = []
+    for i in range(lpp_type.dimension):
+        sign = -1 if lpp_type.signs[i] else 1
+        value.append(sign * (100 + i) / lpp_type.scales[i])
+    return tuple(value)
+
+
+@pytest.fixture
+def buf():
+    """Return a byte string with one item of every known type."""
+    frame = LppFrame()
+    for i, lpp_type in enumerate(LppType.get_lpp_types()):
+        frame.add_by_type(int(lpp_type), i, sample_value(lpp_type))
+    return bytes(frame)
+
+
+def test_records_init():
+    records = LppRecords(8)
+    assert records.capacity == 8
+    assert records.width == 3
+    assert len(records) == 0
+    assert len(records.values) == 24
+    with pytest.raises(ValueError):
+        LppRecords(0)
+
+
+def test_records_decode(buf):
+    records = LppRecords(32)
+    count = records.decode(buf)
+    assert count == len(LppType.get_lpp_types())
+    assert len(records) == count
+    assert records.items() == \
+        [tuple(i) for i in next(LppFrame.decode_many([buf], compact=True))]
+    assert records.value(0) == (100.0,)
+    with pytest.raises(IndexError):
+        records.value(count)
+    # reuse for a smaller payload
+    assert records.decode(bytes([0x01, 0x67, 0xFF, 0xD7])) == 1
+    assert records.items() == [(1, 103, (-4.1,))]
+    assert records.decode(bytes()) == 0
+    assert records.decode(memoryview(buf)) == count
+
+
+def test_records_decode_invalid(buf):
+    records = LppRecords(8)
+    with pytest.raises(BufferError):
+        records.decode(buf)
+    assert records.count == 0
+    records = LppRecords(32)
+    with pytest.raises(BufferError):
+        records.decode(buf[:-1])
+    with pytest.raises(BufferError):
+        records.decode(buf + bytes([0x01]))
+    with pytest.raises(ValueError):
+        records.decode(bytes([0x01, 0xFF, 0x00]))
+    assert len(records) == 0
+
+
+def test_records_decode_allocations(buf):
+    records = LppRecords(32)
+    retained, peak = traced_allocs(records.decode, buf)
+    # all 27 items are written into the preallocated columns, so only the
+    # header walk and the struct tuple and floats of the current item are
+    # alive at a time
+    assert retained == 0
+    assert peak < 1024
@@ -0,0 +1,90 @@
+import pytest
+
+from cayennelpp.lpp_frame import LppFrame
+from cayennelpp.lpp_stream import LppStreamDecoder
+
+
+@pytest.fixture
+def stream():
+    frame = LppFrame()
+    frame.add_temperature(1, -12.3)
+    frame.add_gps(2, 42.3519, -87.9094, 10.0)
+    frame.add_digital_input(3, 1)
+    frame.add_load(4, -5.432)
+    frame.add_accelerometer(5, 0.1, -0.2, 0.98)
+    return bytes(frame) * 4
+
+
+def test_feed_whole(stream):
+    decoder = LppStreamDecoder()
+    items = decoder.feed(stream)
+    assert len(items) == 20
+    assert b''.join([bytes(i) for i in items]) == stream
+    assert decoder.pending == 0
+    assert decoder.position == len(stream)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 13])
+def test_feed_chunks(stream, size):
+    decoder = LppStreamDecoder()
+    items = []
+    for i in range(0, len(stream), size):
+        items += decoder.feed(memoryview(stream)[i:(i + size)])
+        assert decoder.pending < 11
+    assert len(items) == 20
+    assert b''.join([bytes(i) for i in items]) == stream
+    assert decoder.pending == 0
+
+
+def test_feed_partial(stream):
+    decoder = LppStreamDecoder()
+    assert decoder.feed(stream[:1]) == []
+    assert decoder.pending == 1
+    assert decoder.feed(stream[1:3]) == []
+    assert decoder.pending == 3
+    items = decoder.feed(stream[3:4])
+    assert len(items) == 1
+    assert items[0].value == (-12.3,)
+    assert decoder.pending == 0
+    assert decoder.position == 4
+
+
+def test_feed_empty():
+    decoder = LppStreamDecoder()
+    assert decoder.feed(b'') == []
+    decoder.feed(bytes([0x01]))
+    assert decoder.feed(b'') == []
+    assert decoder.pending == 1
+
+
+def test_feed_invalid_type():
+    decoder = LppStreamDecoder()
+    with pytest.raises(ValueError):
+        decoder.feed(bytes([0x01, 0xFF, 0x00]))
+    decoder.reset()
+    assert decoder.pending == 0
+    assert len(decoder.feed(bytes([0x01, 0x67, 0x00, 0xff]))) == 1
+
+
+def test_feed_invalid_type_after_items():
+    decoder = LppStreamDecoder()
+    assert decoder.feed(bytes([0x01, 0x67, 0x00])) == []
+    chunk = bytes([0xff] + [0x02, 0x67, 0x01, 0x10] * 2 + [0x03, 0xEE, 0x00])
+    with pytest.raises(ValueError) as info:
+        decoder.feed(chunk)
+    items = [(d.channel, d.value) for d in info.value.items]
+    assert items == [(1, (25.5,)), (2, (27.2,)), (2, (27.2,))]
+    assert decoder.position == 12
+    decoder.reset()
+    stream = [bytes([0x01, 0x67, 0x00, 0xff, 0x03, 0xEE, 0x00])]
+    results = decoder.decode(stream)
+    assert next(results).value == (25.5,)
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_decode(stream):
+    decoder = LppStreamDecoder()
+    chunks = [stream[i:(i + 6)] for i in range(0, len(stream), 6)]
+    items = list(decoder.decode(chunks))
+    assert b''.join([bytes(i) for i in items]) == stream
@@ -1,8 +1,21 @@
 import pytest
+import pickle
+import struct
 
+from cayennelpp.lpp_frame import LppFrame
 from cayennelpp.lpp_type import LppType
 
 
+@pytest.fixture
+def registry(monkeypatch):
+    """Isolate registrations of a test from the shared registry."""
+    monkeypatch.setattr(LppType, '_LppType__lpp_registry',
+                        list(LppType._LppType__lpp_registry))
+    monkeypatch.setattr(LppType, '_LppType__lpp_prefixes',
+                        dict(LppType._LppType__lpp_prefixes))
+    monkeypatch.setattr(LppType, '_LppType__frozen', False)
+
+
 def test_init_invalid_type():
     with pytest.raises(TypeError):
         LppType("foobar", "foobar", [1], [1], [False])
@@ -40,3 +53,225 @@ def test_get_lpp_type_invalid():
 
 def test_get_lpp_type_none():
     assert not LppType.get_lpp_type(999)
+    assert not LppType.get_lpp_type(-1)
+    assert not LppType.get_lpp_type(255)
+
+
+def test_init_invalid_sizes_value():
+    with pytest.raises(ValueError):
+        LppType(42, "foobar", [5], [1], [False])
+
+
+def test_get_lpp_type_shared():
+    assert LppType.get_lpp_type(103) is LppType.get_lpp_type(103)
+    assert isinstance(LppType.get_lpp_type(103).sizes, tuple)
+
+
+def test_immutable():
+    temp = LppType.get_lpp_type(103)
+    with pytest.raises(AttributeError):
+        temp.scales = (100,)
+    with pytest.raises(AttributeError):
+        temp.fields[0].scale = 100
+    with pytest.raises(AttributeError):
+        del temp.name
+    assert temp.scales == (10,)
+    assert temp.decode(bytes([0x00, 0xFF])) == (25.5,)
+
+
+def test_pickle(registry):
+    temp = LppType.get_lpp_type(103)
+    assert pickle.loads(pickle.dumps(temp)) is temp
+    frame = LppFrame.from_bytes(bytes([0x01, 0x67, 0x00, 0xFF,
+                                       0x02, 0x67, 0x01, 0x10]))
+    copy = pickle.loads(pickle.dumps(frame))
+    assert [d.type for d in copy] == [temp, temp]
+    assert all([d.type is temp for d in copy])
+    assert bytes(copy) == bytes(frame)
+    # types unknown to the unpickling process are recreated by value
+    custom = LppType(200, 'Wind Speed', [2], [100], [False])
+    other = pickle.loads(pickle.dumps(custom))
+    assert other is not custom
+    assert (other.type, other.name, other.sizes) == (200, 'Wind Speed', (2,))
+    registered = LppType.register_type(200, 'Wind Speed', [2], [100],
+                                       [False])
+    assert pickle.loads(pickle.dumps(custom)) is registered
+
+
+def test_decode_from_offset():
+    temp = LppType.get_lpp_type(103)
+    buf = bytes([0x01, 0x67, 0xFF, 0xD7])
+    assert temp.decode_from(buf, 2) == (-4.1,)
+    with pytest.raises(BufferError):
+        temp.decode_from(buf, 3)
+
+
+def test_encode_into_offset():
+    load = LppType.get_lpp_type(122)
+    buf = bytearray(5)
+    assert load.encode_into(buf, 2, (-0.001,)) == 3
+    assert buf == bytearray([0x00, 0x00, 0xFF, 0xFF, 0xFF])
+    assert load.decode_from(buf, 2) == (-0.001,)
+
+
+def test_get_lpp_types():
+    types = LppType.get_lpp_types()
+    assert len(types) == 27
+    assert [int(t) for t in types] == sorted([int(t) for t in types])
+    assert types[0] is LppType.get_lpp_type(0)
+
+
+def test_register_type(registry):
+    custom = LppType.register_type(200, 'Wind Speed', [2, 2], [100, 1],
+                                   [False, False])
+    assert LppType.get_lpp_type(200) is custom
+    assert custom in LppType.get_lpp_types()
+    assert custom.size == 4
+    frame = LppFrame()
+    frame.add_by_type(200, 1, (12.34, 270))
+    buf = bytes(frame)
+    assert buf == bytes([0x01, 0xC8, 0x04, 0xD2, 0x01, 0x0E])
+    assert LppFrame.from_bytes(buf).data[0].value == (12.34, 270)
+    assert LppFrame.validate(buf).valid
+    assert LppType.get_lpp_types_by_name('wind') == (200,)
+    assert frame.get_by_name('Wind Speed') == frame.data
+
+
+def test_register_type_conflicts(registry):
+    with pytest.raises(ValueError):
+        LppType.register_type(103, 'Other', [2], [10], [True])
+    with pytest.raises(ValueError):
+        LppType.register_type(200, 'temperature', [2], [10], [True])
+    with pytest.raises(ValueError):
+        LppType.register_type(256, 'Other', [2], [10], [True])
+    with pytest.raises(TypeError):
+        LppType.register_type('200', 'Other', [2], [10], [True])
+    with pytest.raises(ValueError):
+        LppType.register_type(200, 'Other', [5], [10], [True])
+    assert LppType.get_lpp_type(200) is None
+
+
+def test_freeze_types(registry):
+    LppType.freeze_types()
+    with pytest.raises(RuntimeError):
+        LppType.register_type(200, 'Other', [2], [10], [True])
+    assert LppType.get_lpp_type(200) is None
+
+
+def test_get_lpp_types_by_name():
+    assert LppType.get_lpp_types_by_name('Temperature') == (103,)
+    assert LppType.get_lpp_types_by_name(' temp ') == (103,)
+    assert sorted(LppType.get_lpp_types_by_name('analog')) == [2, 3]
+    assert len(LppType.get_lpp_types_by_name('')) == 27
+    assert LppType.get_lpp_types_by_name('foo') == ()
+
+
+def test_decode_raw():
+    load = LppType.get_lpp_type(122)
+    assert load.decode_raw(bytes([0xFF, 0xFF, 0xFF])) == (-1,)
+    gps = LppType.get_lpp_type(136)
+    buf = bytes([0x06, 0x76, 0x5F, 0xF2, 0x96, 0x0A, 0x00, 0x03, 0xE8])
+    assert gps.decode_raw(buf) == (423519, -879094, 1000)
+    assert gps.scales == (10000, 10000, 100)
+    temp = LppType.get_lpp_type(103)
+    assert temp.decode_raw_from(bytes([0x01, 0x67, 0xFF, 0xD7]), 2) == (-41,)
+    with pytest.raises(BufferError):
+        temp.decode_raw(bytes([0xFF]))
+    with pytest.raises(BufferError):
+        temp.decode_raw_from(bytes([0xFF, 0xD7]), 1)
+
+
+def test_encode_raw():
+    gps = LppType.get_lpp_type(136)
+    buf = bytes([0x06, 0x76, 0x5F, 0xF2, 0x96, 0x0A, 0x00, 0x03, 0xE8])
+    assert gps.encode_raw((423519, -879094, 1000)) == buf
+    temp = LppType.get_lpp_type(103)
+    # exact round trip, where float scaling truncates 0.29 * 100 to 28
+    analog = LppType.get_lpp_type(2)
+    assert analog.decode_raw(analog.encode_raw((29,))) == (29,)
+    assert analog.decode(analog.encode((0.29,))) == (0.28,)
+    buf = bytearray(4)
+    assert temp.encode_raw_into(buf, 2, -41) == 2
+    assert buf == bytearray([0x00, 0x00, 0xFF, 0xD7])
+    with pytest.raises(TypeError):
+        temp.encode_raw((4.1,))
+    with pytest.raises(ValueError):
+        temp.encode_raw((1 << 16,))
+    with pytest.raises(ValueError):
+        LppType.get_lpp_type(104).encode_raw((-1,))
+    with pytest.raises(ValueError):
+        gps.encode_raw((1, 2))
+
+
+def test_encode_raw_range():
+    temp = LppType.get_lpp_type(103)
+    assert temp.decode_raw(temp.encode_raw((32767,))) == (32767,)
+    assert temp.decode_raw(temp.encode_raw((-32768,))) == (-32768,)
+    for value in (32768, 40000, -32769, -70000):
+        with pytest.raises(ValueError):
+            temp.encode_raw((value,))
+    load = LppType.get_lpp_type(122)
+    assert load.decode_raw(load.encode_raw((-(1 << 23),))) == (-(1 << 23),)
+    with pytest.raises(ValueError):
+        load.encode_raw((1 << 23,))
+    generic = LppType.get_lpp_type(100)
+    assert generic.decode_raw(generic.encode_raw((0xFFFFFFFF,))) == \
+        (0xFFFFFFFF,)
+    with pytest.raises(ValueError):
+        generic.encode_raw((1 << 32,))
+
+
+def test_decode_table():
+    humidity = LppType.get_lpp_type(104)
+    value = humidity.decode(bytes([0x5B]))
+    assert value == (45.5,)
+    assert humidity.decode(bytes([0x5B])) is value
+    assert humidity.decode_from(bytes([0x00, 0xFF]), 1) == (127.5,)
+    colour = LppType.get_lpp_type(135)
+    assert colour.decode(bytes([0xFF, 0x80, 0x00])) == (255.0, 128.0, 0.0)
+    with pytest.raises(BufferError):
+        colour.decode_from(bytes([0xFF, 0x80]))
+
+
+def test_decode_table_signed(registry):
+    tilt = LppType.register_type(201, 'Tilt', [1, 1], [2, 1], [True, False])
+    buf = bytes([0xFF, 0xFF])
+    assert tilt.decode(buf) == (-0.5, 255.0)
+    raw = struct.unpack('>' + tilt.decode_format, buf)
+    assert tilt.unpack_values(raw) == \
+        (-0.5, 255.0)
+    for b in range(256):
+        raw = tilt.decode_raw(bytes([b, b]))
+        assert tilt.decode(bytes([b, b])) == (raw[0] / 2, raw[1] / 1)
+
+
+def test_decode_into():
+    out = [0.0] * 5
+    gps = LppType.get_lpp_type(136)
+    buf = bytes([0x00, 0x06, 0x76, 0x5F, 0xF2, 0x96, 0x0A, 0x00, 0x03, 0xE8])
+    assert gps.decode_into(buf, 1, out, 2) == 3
+    assert out == [0.0, 0.0, 42.3519, -87.9094, 10.0]
+    colour = LppType.get_lpp_type(135)
+    assert colour.decode_into(bytes([1, 2, 3]), 0, out) == 3
+    assert out[:3] == [1.0, 2.0, 3.0]
+    temp = LppType.get_lpp_type(103)
+    assert temp.decode_into(bytes([0xFF, 0xD7]), 0, out, 4) == 1
+    assert out[4] == -4.1
+    humidity = LppType.get_lpp_type(104)
+    assert humidity.decode_into(bytes([0x5B]), 0, out) == 1
+    assert out[0] == 45.5
+    with pytest.raises(BufferError):
+        gps.decode_into(buf, 2, out)
+
+
+def test_codec_accessors():
+    gps = LppType.get_lpp_type(136)
+    assert gps.decode_format == 'bHbHbH'
+    assert gps.encode_format == 'BHBHBH'
+    assert [f.offset for f in gps.fields] == [0, 3, 6]
+    assert [f.scale for f in gps.fields] == [10000, 10000, 100]
+    field = LppType.get_lpp_type(103).fields[0]
+    assert (field.size, field.signed, field.limit, field.mask) == \
+        (2, True, 1 << 16, 0xffff)
+    assert field.to_raw(-4.1) == 0xffd7
+    assert field.check_raw(-41) == 0xffd7
@@ -32,3 +32,10 @@ def test_json_encode_type_str(frame):
 def test_json_encode_invalid():
     with pytest.raises(TypeError):
         json.dumps(type("foobar", (object,), {}), default=LppUtil.json_encode)
+
+
+def test_json_encode_lazy(frame):
+    eager = LppFrame.from_bytes(bytes(frame))
+    lazy = LppFrame.from_bytes(bytes(frame), lazy=True)
+    assert json.dumps(lazy, default=LppUtil.json_encode) == \
+        json.dumps(eager, default=LppUtil.json_encode)
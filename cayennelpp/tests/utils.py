@@ -0,0 +1,21 @@
+import itertools
+import tracemalloc
+
+
+def traced_allocs(func, *args, repeat=100):
+    """Call `func(*args)` `repeat` times with tracemalloc enabled.
+
+    The function is called once before tracing, to exclude caches filled on
+    first use. Return the number of bytes still allocated afterwards and the
+    peak number of bytes allocated at once, both relative to the start.
+    """
+    func(*args)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in itertools.repeat(None, repeat):
+            func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current - before, peak - before
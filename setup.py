@@ -32,5 +32,6 @@ setup(
     packages=['cayennelpp'],
     setup_requires=["pytest-runner"],
     tests_require=['pytest'],
+    extras_require={'numpy': ['numpy']},
     include_package_data=True
 )